@@ -26,6 +26,7 @@ from folium.plugins import MarkerCluster
 
 
 
+from .region import HazardRegion
 from .floods.river_list import river_list
 from .floods.elevation import river_elevation 
 from .floods.building_plot import building_plot
@@ -35,6 +36,9 @@ from .floods.building_pieplot import building_pieplot
 from .floods.buffered_piechart import buffered_piechart
 from .floods.building_elev import building_elev
 from .floods.building_dis import building_dis
+from .floods.exposure_curve import exposure_curve
+from .floods.river_bands import river_bands
+from .building_types import building_type_counts
 from .floods.river_plot import river_plot
 from .floods.building_elev_plot import building_elev_plot
 #from .earthquake.earthquake_buffer import earthquake_buffer
@@ -43,6 +47,12 @@ from .sea_level_rise.sea_level_bar_chart import sea_level_bar_chart
 from .sea_level_rise.sea_level_building_density import sea_level_building_density
 from .sea_level_rise.sea_level_buildings import sea_level_buildings
 from .sea_level_rise.sea_level_buildings_plot import sea_level_buildings_plot
+from .sea_level_rise.sea_level_index import sea_level_index
+#from osm import
+from .osm import cache_settings, clear_cache, osm_source, region_boundary, tile_settings, features_layers, road_network, refresh_region
+from .osm.fetch_async import fetch_regions
+#from dem import
+from .dem import RasterSampler, ElevationIndex, build_overviews
 #from landslides import
 from .landslides.basic_map import landslide_map 
 from .landslides.landslide_density import landslide_density #<-- issue loading sns 
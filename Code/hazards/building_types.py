@@ -0,0 +1,66 @@
+from .third_party import np, pd, plt
+
+#OSM building values that do not describe a building type
+EXCLUDED = ('yes', 'no')
+
+
+def building_type_counts(types, exclude = EXCLUDED):
+    """
+    Return the number of buildings of each building classification, largest first. The classifications are stored as a categorical, so every building is counted in a single pass and only exact matches are counted (e.g. 'greenhouse' is not counted as a 'house').
+
+    Parameters
+    ----------
+    types: Union[pandas.core.series.Series, list]
+        The building classification of each building, e.g. the 'building' column of building_setup
+    exclude: list, Optional
+        The classifications left out of the counts. Default = ('yes', 'no')
+
+    Returns
+    -------
+    counts: pandas.core.series.Series
+        The number of buildings of each classification, indexed by classification
+
+    Example: hazards.building_type_counts(hazards.building_dis('Peebles')['building'])
+    """
+    types = pd.Series(types).dropna().astype('category')
+    counts = types.value_counts()
+    counts = counts[(counts > 0) & ~counts.index.isin(exclude)]
+    counts.index = counts.index.astype(str)
+    return counts
+
+
+def building_type_split(counts, n = 9, m = 20):
+    """
+    Split building type counts into the n largest classifications plus 'Other' (all the remaining buildings) for a pie chart, and the next m largest classifications for a bar chart.
+    """
+    pie = pd.concat([counts.iloc[:n], pd.Series({'Other': counts.iloc[n:].sum()})])
+    bar = counts.iloc[n:n + m]
+    return pie, bar
+
+
+def building_type_table(groups, types, exclude = EXCLUDED):
+    """
+    Return the number of buildings of each classification (columns) in each group (rows), e.g. each distance or elevation band, from one bincount over the combined group and classification codes. Buildings without a group or classification are not counted.
+    """
+    groups = groups if isinstance(groups, pd.Categorical) else pd.Categorical(groups)
+    types = pd.Categorical(np.asarray(types, dtype = object))
+    valid = (groups.codes >= 0) & (types.codes >= 0)
+    counts = np.bincount(groups.codes[valid] * len(types.categories) + types.codes[valid], minlength = len(groups.categories) * len(types.categories))
+    table = pd.DataFrame(counts.reshape(len(groups.categories), len(types.categories)), index = groups.categories, columns = types.categories.astype(str))
+    return table.drop(columns = [e for e in exclude if e in table.columns])
+
+
+def plot_building_types(pie, bar, n, title):
+    #The pie chart of the largest classifications next to the bar chart of the classifications in 'Other'
+    fig, ax = plt.subplots(1, 2, figsize=(15, 8))
+
+    plt.subplot(1, 2, 1)
+    plt.pie(pie, labels = pie.index, colors = plt.cm.tab10(np.arange(10)))
+    plt.title(title)
+
+    plt.subplot(1, 2, 2)
+    plt.bar(bar.index, bar, color = plt.cm.tab10(n))
+    plt.xticks(rotation=90)
+    plt.grid(linestyle = "dashed" , alpha = 0.5)
+    plt.title('Other Building Types')
+    return fig
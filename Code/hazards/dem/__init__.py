@@ -0,0 +1,5 @@
+#Digital elevation model (DEM) access shared by the hazard sub-packages
+from .sampler import RasterSampler
+from .window import dem_polygon, read_window, point_elevations
+from .bands import in_band, band_edges, ElevationIndex
+from .overviews import build_overviews
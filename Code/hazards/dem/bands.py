@@ -0,0 +1,82 @@
+from ..third_party import np, pd
+
+#Elevation band classification shared by the sea level functions. A value is in the band low to high when low < value < high, and NaN values (off the DEM or nodata) are in no band.
+
+
+def in_band(values, low, high):
+    """
+    Return a boolean array of the values between low and high (exclusive).
+    """
+    values = np.asarray(values, dtype = float)
+    return (values > low) & (values < high)
+
+
+def band_edges(low, step_size, count):
+    #The edges of count bands of width step_size starting at low
+    return [low + i * step_size for i in range(count + 1)]
+
+
+class ElevationIndex:
+    """
+    The elevations of a set of buildings held sorted (per group, e.g. per building type), so the number of buildings in any elevation band is found with a binary search. The elevations are found once, and any low, step_size, count or high can then be counted in O(log n) per band without reading the DEM again.
+
+    Parameters
+    ----------
+    elevations: numpy.ndarray
+        The elevation of each building, NaN for buildings off the DEM (these are left out)
+    groups: Union[pandas.core.series.Series, list], Optional
+        The group of each building, e.g. the 'building' column. Default = None, meaning a single group
+
+    Attributes
+    ----------
+    values: numpy.ndarray
+        The elevations, sorted within each group
+    groups: pandas.core.indexes.base.Index
+        The groups
+    offsets: numpy.ndarray
+        The elevations of group k are values[offsets[k]:offsets[k + 1]]
+    """
+    def __init__(self, elevations, groups = None):
+        elevations = np.asarray(elevations, dtype = float)
+        groups = pd.Categorical(np.zeros(len(elevations), dtype = int) if groups is None else np.asarray(groups, dtype = object))
+        keep = ~np.isnan(elevations) & (groups.codes >= 0)
+        codes, elevations = groups.codes[keep], elevations[keep]
+        order = np.lexsort((elevations, codes))
+        self.values = elevations[order]
+        self.groups = groups.categories
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength = len(self.groups)))])
+
+    def __len__(self):
+        return len(self.values)
+
+    def _counts(self, values, edges):
+        #Bands are open at both ends (edges[i] < e < edges[i + 1]), as in in_band
+        return np.searchsorted(values, edges[1:], side = 'left') - np.searchsorted(values, edges[:-1], side = 'right')
+
+    def count(self, low, high):
+        """
+        Return the number of buildings with low < elevation < high.
+        """
+        return int(self.band_counts([low, high])[0])
+
+    def band_counts(self, edges, by_group = False):
+        """
+        Return the number of buildings in each band between consecutive edges.
+
+        Parameters
+        ----------
+        edges: list
+            The increasing edges of the bands, e.g. from band_edges
+        by_group: bool, Optional
+            Whether to count each group separately. Default = False
+
+        Returns
+        -------
+        counts: Union[numpy.ndarray, pandas.core.frame.DataFrame]
+            The number of buildings in each band, or a DataFrame of the number in each group (rows) and band (columns)
+        """
+        edges = np.asarray(edges, dtype = float)
+        table = np.array([self._counts(self.values[self.offsets[k]:self.offsets[k + 1]], edges) for k in range(len(self.groups))], dtype = int).reshape(len(self.groups), len(edges) - 1)
+        if by_group:
+            return pd.DataFrame(table, index = self.groups.astype(str))
+        return table.sum(axis = 0)
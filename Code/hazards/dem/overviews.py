@@ -0,0 +1,64 @@
+import os
+
+from ..third_party import rasterio, Resampling, Window
+from .sampler import close_datasets
+
+
+def build_overviews(geotiff, factors = (2, 4, 8, 16, 32), resampling = 'average', external = False):
+    """
+    Build overviews (reduced resolution copies) of a geotiff once, so the DEM functions can read a coarser copy when given a resolution, e.g. hazards.sea_level_buildings(geotiff, resolution = 30).
+
+    Parameters
+    ----------
+    geotiff: str
+        The str name of the geotiff
+    factors: list, Optional
+        The decimation factors of the overviews, e.g. 4 gives pixels 4 times the size. Default = (2, 4, 8, 16, 32)
+    resampling: str, Optional
+        The rasterio resampling method used to make the overviews, e.g. 'average', 'nearest' or 'bilinear'. Default = 'average'
+    external: bool, Optional
+        Whether to write the overviews to a sidecar geotiff.ovr file instead of inside the geotiff, e.g. for read only files. The geotiff is then only opened for reading, but its folder must be writable. Default = False
+
+    Returns
+    -------
+    factors: list
+        The decimation factors of the overviews now held by the geotiff
+
+    Example: hazards.build_overviews('DEM.tif')
+    """
+    #Handles kept open by the DEM functions would not see the new overviews
+    close_datasets(geotiff)
+    if external:
+        _sidecar(geotiff, sorted(factors), Resampling[resampling])
+    else:
+        try:
+            src = rasterio.open(geotiff, 'r+')
+        except rasterio.errors.RasterioIOError as error:
+            raise PermissionError(f'{geotiff} cannot be opened for writing, use external = True to write the overviews to a sidecar .ovr file instead') from error
+        with src:
+            src.build_overviews(list(factors), Resampling[resampling])
+            src.update_tags(ns = 'rio_overview', resampling = resampling)
+    with rasterio.open(geotiff) as src:
+        return src.overviews(1)
+
+
+def _sidecar(geotiff, factors, resampling, strip = 1024):
+    #The geotiff.ovr sidecar is a geotiff of its own, which GDAL reads as the overviews of the geotiff: its full image is the first (finest) overview and its own internal overviews are the coarser ones. The geotiff is only opened for reading, so this also works on read only files.
+    path = geotiff + '.ovr'
+    temp = path + '.tmp'
+    first = factors[0]
+    with rasterio.open(geotiff) as src:
+        height, width = -(-src.height // first), -(-src.width // first)
+        t = src.transform
+        profile = src.profile
+        profile.update(driver = 'GTiff', height = height, width = width, transform = rasterio.Affine(t.a * src.width / width, t.b, t.c, t.d, t.e * src.height / height, t.f))
+        #The first overview is written in strips of rows, so only a strip of the geotiff is held in memory at a time
+        with rasterio.open(temp, 'w', **profile) as dst:
+            for row in range(0, height, strip):
+                rows = min(strip, height - row)
+                window = Window(0, row * first, src.width, min(rows * first, src.height - row * first))
+                dst.write(src.read(window = window, out_shape = (src.count, rows, width), resampling = resampling), window = Window(0, row, width, rows))
+            coarser = [int(round(factor / first)) for factor in factors[1:] if round(factor / first) >= 2]
+            if coarser:
+                dst.build_overviews(coarser, resampling)
+    os.replace(temp, path)
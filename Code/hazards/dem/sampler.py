@@ -0,0 +1,122 @@
+from collections import OrderedDict
+
+from ..third_party import np, rasterio, Window
+
+#Geotiffs opened by the package, most recently used last. The handles are kept open between calls so each file is only opened once.
+MAX_OPEN = 8
+handles = OrderedDict()
+
+
+#Metres in one degree of latitude, to compare the pixels of a lat, lon geotiff with a resolution in metres
+METRES_PER_DEGREE = 111320
+
+
+def overview_level(src, resolution, band = 1):
+    """
+    Return the overview level of an open geotiff with the coarsest pixels that are no larger than resolution (in metres), or None if only the full resolution meets it (or the geotiff has no overviews, see build_overviews).
+    """
+    if resolution is None:
+        return None
+    pixel = abs(src.transform.e) * (METRES_PER_DEGREE if src.crs is None or src.crs.is_geographic else 1)
+    level = None
+    for i, factor in enumerate(src.overviews(band)):
+        if pixel * factor <= resolution:
+            level = i
+    return level
+
+
+def open_dataset(geotiff_path, resolution = None):
+    """
+    Return an open rasterio dataset for a geotiff, reusing the handle from an earlier call if there is one. The least recently used handle is closed once more than MAX_OPEN files are open.
+
+    If a resolution (in metres) is given, the coarsest overview of the geotiff that meets it is opened instead, so fewer bytes are read.
+    """
+    level = None
+    if resolution is not None:
+        level = overview_level(open_dataset(geotiff_path), resolution)
+    key = geotiff_path if level is None else (geotiff_path, level)
+    src = handles.get(key)
+    if src is not None and not src.closed:
+        handles.move_to_end(key)
+        return src
+    src = rasterio.open(geotiff_path) if level is None else rasterio.open(geotiff_path, overview_level = level)
+    handles[key] = src
+    while len(handles) > MAX_OPEN:
+        path, old = handles.popitem(last = False)
+        old.close()
+    return src
+
+
+def close_datasets(geotiff_path = None):
+    #Close every geotiff kept open by open_dataset, or only the handles of geotiff_path (including its overviews)
+    for key in list(handles):
+        if geotiff_path is None or key == geotiff_path or (isinstance(key, tuple) and key[0] == geotiff_path):
+            handles.pop(key).close()
+
+
+class RasterSampler:
+    """
+    Reads the values of a geotiff (e.g. a DEM) at many points at once. All points are converted to pixel rows and columns in one vectorised inverse affine transform, and only the blocks of the file that hold a point are read.
+
+    Parameters
+    ----------
+    geotiff_path: str
+        The str name of the geotiff
+    band: int, Optional
+        The band sampled. Default = 1
+    resolution: float, Optional
+        The pixel size in metres that is good enough. The coarsest overview of the geotiff that meets it is sampled. Default = None, meaning the full resolution
+
+    Example: sampler = hazards.RasterSampler('DEM.tif')
+             elevation = sampler.sample(network.coords)
+    """
+    def __init__(self, geotiff_path, band = 1, resolution = None):
+        self.geotiff_path = geotiff_path
+        self.band = band
+        self.resolution = resolution
+
+    @property
+    def dataset(self):
+        return open_dataset(self.geotiff_path, resolution = self.resolution)
+
+    def rowcol(self, xs, ys):
+        """
+        Return the pixel rows and columns of arrays of x, y (lon, lat) coordinates.
+        """
+        t = self.dataset.transform
+        xs = np.asarray(xs, dtype = float) - t.c
+        ys = np.asarray(ys, dtype = float) - t.f
+        det = t.a * t.e - t.b * t.d
+        cols = np.floor((t.e * xs - t.b * ys) / det).astype(np.int64)
+        rows = np.floor((t.a * ys - t.d * xs) / det).astype(np.int64)
+        return rows, cols
+
+    def sample(self, coords):
+        """
+        Return the value of the geotiff at each (x, y) coordinate, as a float array in the same order. Points outside the geotiff or on nodata pixels are NaN.
+        """
+        coords = np.asarray(coords, dtype = float).reshape(-1, 2)
+        values = np.full(len(coords), np.nan)
+        src = self.dataset
+        rows, cols = self.rowcol(coords[:, 0], coords[:, 1])
+        inside = np.flatnonzero((rows >= 0) & (rows < src.height) & (cols >= 0) & (cols < src.width))
+        if len(inside) == 0:
+            return values
+
+        #Read each block of the file that holds at least one point once
+        block_height, block_width = src.block_shapes[self.band - 1]
+        blocks, block_of = np.unique(np.column_stack([rows[inside] // block_height, cols[inside] // block_width]), axis = 0, return_inverse = True)
+        block_of = block_of.reshape(-1)
+        order = np.argsort(block_of, kind = 'stable')
+        starts = np.searchsorted(block_of[order], np.arange(len(blocks) + 1))
+        nodata = src.nodata
+        for k, (block_row, block_col) in enumerate(blocks):
+            points = inside[order[starts[k]:starts[k + 1]]]
+            row_off, col_off = block_row * block_height, block_col * block_width
+            window = Window(col_off, row_off, min(block_width, src.width - col_off), min(block_height, src.height - row_off))
+            data = src.read(self.band, window = window)
+            found = data[rows[points] - row_off, cols[points] - col_off].astype(float)
+            if nodata is not None:
+                found[found == nodata] = np.nan
+            values[points] = found
+        return values
@@ -0,0 +1,58 @@
+from ..third_party import np, Polygon, Window
+from .sampler import open_dataset, RasterSampler
+
+#Reads only the parts of a DEM that are needed, through the handles and inverse transform of dem.sampler, so the memory used follows the size of the region (or the number of points) rather than of the file.
+
+
+def dem_polygon(geotiff):
+    """
+    Return the polygon of the area covered by a geotiff, from its header only.
+    """
+    src = open_dataset(geotiff)
+    a, b, c, d = src.transform.a, src.transform.c, src.transform.e, src.transform.f
+    end_x = a * src.width + b
+    end_y = c * src.height + d
+    return Polygon([(b,d), (b,end_y), (end_x, end_y), (end_x,d)])
+
+
+def read_window(geotiff, bounds, band = 1, resolution = None):
+    """
+    Read the pixels of a geotiff that cover bounds, for analyses that need the raster itself. The whole window is held in memory, so use point_elevations (or RasterSampler) for the values under a set of points, which only reads the blocks that hold a point.
+
+    Parameters
+    ----------
+    geotiff: str
+        The str name of the geotiff
+    bounds: Tuple[float, float, float, float]
+        The (min lon, min lat, max lon, max lat) of the region, e.g. buildings.total_bounds
+    band: int, Optional
+        The band read. Default = 1
+    resolution: float, Optional
+        The pixel size in metres that is good enough. The window is read from the coarsest overview of the geotiff that meets it. Default = None, meaning the full resolution
+
+    Returns
+    -------
+    elevation: numpy.ndarray
+        The pixels of the window, clipped to the edges of the geotiff (empty if bounds do not overlap it)
+    transform: Tuple[float, float, float, float]
+        The (pixel width, left edge, pixel height, top edge) of the window, the pixel height being negative
+    """
+    sampler = RasterSampler(geotiff, band = band, resolution = resolution)
+    src = sampler.dataset
+    t = src.transform
+    minx, miny, maxx, maxy = bounds
+    #The pixels under the top left and bottom right corners, from the same inverse transform used for sampling
+    rows, cols = sampler.rowcol([minx, maxx], [maxy, miny])
+    col0, col1 = max(cols.min(), 0), min(cols.max() + 1, src.width)
+    row0, row1 = max(rows.min(), 0), min(rows.max() + 1, src.height)
+    if col1 <= col0 or row1 <= row0:
+        return np.empty((0, 0), dtype = src.dtypes[band - 1]), (t.a, t.c, t.e, t.f)
+    elevation = src.read(band, window = Window(col0, row0, col1 - col0, row1 - row0))
+    return elevation, (t.a, t.c + col0 * t.a, t.e, t.f + row0 * t.e)
+
+
+def point_elevations(geotiff, points, resolution = None):
+    """
+    Return the elevation of a geotiff under each point (e.g. the building centroids) with RasterSampler, so only the blocks of the file that hold a point are read. Points outside the geotiff or on nodata pixels are NaN. A resolution in metres samples the coarsest overview that meets it.
+    """
+    return RasterSampler(geotiff, resolution = resolution).sample(np.column_stack([points.x.to_numpy(), points.y.to_numpy()]))
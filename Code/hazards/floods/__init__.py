@@ -22,5 +22,7 @@ from .river_plot import river_plot
 from .buffered_piechart import buffered_piechart
 from .building_elev import building_elev
 from .building_dis import building_dis
+from .exposure_curve import exposure_curve
+from .river_bands import river_bands
 from .building_elev_plot import building_elev_plot
 
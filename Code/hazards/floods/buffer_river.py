@@ -1,18 +1,23 @@
 from .river_list import river_list
 from ..third_party import Point, pd
+from .buffer_zone import buffer_zone
+from ..region import region_cache
 
-def river_buffer(*args, buffer_distance=0.003, river_cutoff=0.005, print_list = True):
+@region_cache('buffer_distance', 'river_cutoff', 'units')
+def river_buffer(*args, buffer_distance=0.003, river_cutoff=0.005, units = 'degrees', print_list = True):
     """
     Returns the river plot, polygon of an area and the river buffer for a chosen region. 
     
     Parameters:
     -----------
     *args: Union[str, Tuple[float, float, float, float]]
-        The positional arguments. This accepts either a single string 'location' value, which must be recognized as a region in OSM. Otherwise, 4 float arguments are accepted as 'north, south, east, west', defining a box for the chosen region
+        The positional arguments. This accepts either a single string 'location' value, which must be recognized as a region in OSM. Otherwise, 4 float arguments are accepted as 'north, south, east, west', defining a box for the chosen region. A HazardRegion can also be passed instead, so the OSM data is reused between functions
     buffer_distance: float, Optional
-    	The buffer given to the river. This is in degrees. Default = 0.003 degrees.
+    	The buffer given to the river. This is in degrees, or in m if units = 'm'. Default = 0.003 degrees.
     river_cutoff: float, Optional
     	The buffer given to the polygon of the chosen region outside of which river coordinates are dropped to provide a smaller dataset for the chosen region
+    units: str, Optional
+    	The units of buffer_distance, 'degrees' or 'm'. With 'm' the rivers are buffered in the local UTM projection. Default = 'degrees'
     	
     Returns:
     --------
@@ -30,12 +35,8 @@ def river_buffer(*args, buffer_distance=0.003, river_cutoff=0.005, print_list =
     
     #Pull info from river list for the river and polygons.
     river, polygon, buffered_polygon = river_list(*args, buffer=river_cutoff, print_list = print_list)
-    buffer_total = Point(0, 0).buffer(0)
 
-	#Cut the river data to just points inside of the given buffere region. 
-    for i in range(len(river)):
-        riv = river.loc[river.index[i], 'new geometry']
-        buffer = riv.buffer(buffer_distance)
-        buffer_total = buffer_total.union(buffer)
+	#Buffer the river data cut to the given buffer region, all rivers at once, and merge the buffers into one shape.
+    buffer_total = buffer_zone(river['new geometry'], buffer_distance, units = units)
 
     return river, polygon, buffer_total
@@ -0,0 +1,43 @@
+from ..third_party import np, gpd, shapely, STRtree
+
+
+def buffer_zone(geometries, distance, units = 'degrees'):
+    """
+    Return the area within a distance of any of the geometries (e.g. the rivers of a region) as one shape. All geometries are buffered in one vectorised call and merged with a single cascaded union.
+
+    Parameters
+    ----------
+    geometries: Union[geopandas.geoseries.GeoSeries, numpy.ndarray]
+        The geometries to buffer, in lat, lon
+    distance: float
+        The buffer distance
+    units: str, Optional
+        'degrees' to buffer in lat, lon, or 'm' to buffer in metres in the local UTM projection. Default = 'degrees'
+
+    Returns
+    -------
+    shape: shapely.geometry.multipolygon.MultiPolygon
+        The polygon or multipolygon of the buffers, in lat, lon
+    """
+    geometries = gpd.GeoSeries(np.asarray(geometries), crs = 'EPSG:4326')
+    geometries = geometries[geometries.notna() & ~geometries.is_empty]
+    if len(geometries) == 0:
+        return shapely.Polygon()
+    if units == 'm':
+        crs = geometries.estimate_utm_crs()
+        shape = shapely.union_all(geometries.to_crs(crs).buffer(distance).values)
+        return gpd.GeoSeries([shape], crs = crs).to_crs('EPSG:4326').iloc[0]
+    return shapely.union_all(shapely.buffer(geometries.values, distance))
+
+
+def intersecting(shape, geometries):
+    """
+    Return a boolean array of the geometries (e.g. buildings) that intersect shape, from one spatial index query. The tree is built over the geometries and shape is prepared once, so only the geometries near shape are tested exactly.
+    """
+    geometries = np.asarray(geometries)
+    mask = np.zeros(len(geometries), dtype = bool)
+    if shape is None or shape.is_empty or len(geometries) == 0:
+        return mask
+    shapely.prepare(shape)
+    mask[STRtree(geometries).query(shape, predicate = 'intersects')] = True
+    return mask
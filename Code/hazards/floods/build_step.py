@@ -1,5 +1,9 @@
 from ..third_party import ox 
+from ..osm.features import features_from_place
+from ..osm.tiles import features_from_bbox_tiled
+from ..region import region_cache
 
+@region_cache(base = True)
 def building_setup(*args):
     """
     Return the building data for a chosen region. The returned dataframe contains the building amenity, geometry, building classification and type extracted from OpenStreetMaps (OSM). This function is used in many of the other functions that produce building related plots
@@ -7,7 +11,7 @@ def building_setup(*args):
     Parameters
     ----------
     *args: Union[str, Tuple[float, float, float, float]]
-        The positional arguments. This accepts either a single string 'location' value, which must be recognized as a region in OSM. Otherwise, 4 float arguments are accepted as 'north, south, east, west', defining a box for the chosen region
+        The positional arguments. This accepts either a single string 'location' value, which must be recognized as a region in OSM. Otherwise, 4 float arguments are accepted as 'north, south, east, west', defining a box for the chosen region. A HazardRegion can also be passed instead, so the OSM data is reused between functions
 
     Returns
     -------
@@ -21,13 +25,33 @@ def building_setup(*args):
     if len(args) == 1 and isinstance(args[0], str):
         name = args[0]
         print(f'Processing plot: {name}')
-        buildings = ox.features_from_place(name, tags=tags)
+        buildings = features_from_place(name, tags=tags)
     elif len(args) == 4:
         print('Processing lat long grid')
-        buildings = ox.features_from_bbox(args[0], args[1], args[2], args[3], tags=tags) #north, south, east, west
+        buildings = features_from_bbox_tiled(args[0], args[1], args[2], args[3], tags=tags) #north, south, east, west
     else: #Code returned if wrong amount of arguments passed
         print('Invalid arguments passed. Either -')
         print('        1 values: The name of a given area, number of building types in pie chart, number of values of bar plot')
         print('        4 values: lat1, lat2, lon1, lon2, number of building types in pie chart, number of values of bar plot')
 
     return buildings[['amenity', 'geometry', 'building', 'type']]
+
+
+@region_cache()
+def building_centroids(*args):
+    """
+    Return the building data from building_setup with an additional 'centroid' column of the lat, lon centroid of each building. When a HazardRegion is passed the reprojection is only done once for that region.
+
+    Parameters
+    ----------
+    *args: Union[str, Tuple[float, float, float, float]]
+        The positional arguments. This accepts either a single string 'location' value, which must be recognized as a region in OSM. Otherwise, 4 float arguments are accepted as 'north, south, east, west', defining a box for the chosen region. A HazardRegion can also be passed instead, so the OSM data is reused between functions
+
+    Returns
+    -------
+    buildings: geopandas.geodataframe.GeoDataFrame
+    	The building information from building_setup including the centroid of each building
+    """
+    buildings = building_setup(*args)
+    buildings['centroid'] = (buildings['geometry'].to_crs(crs=3857).centroid).to_crs(crs=4326)
+    return buildings
@@ -1,74 +1,76 @@
 from ..third_party import Point, np, ox, rasterio, gpd, wkt, plt
 from .river_list import river_list
-from .build_step import building_setup
+from .build_step import building_centroids
+from .nearest_river import nearest_river_m
+from .river_network import river_network
+from .raster_distance import raster_river_distance
+from .exposure_curve import exposure_curve
+from ..region import HazardRegion, find_region
 
-def building_dis(*args):
+def building_dis(*args, distance_m = False, max_distance = None, engine = 'vector', geotiff_path = None, resolution = None):
     """
-    Returns building information for each building in a given region. This includes the geometries, centroid locations and distance in m from the rivers in the chosen area. This building information has been extracted from OpenStreetMaps (OSM).
+    Returns building information for each building in a given region. This includes the geometries, centroid locations and distance in m from the rivers in the chosen area, and the name and OSM id of the nearest river. This building information has been extracted from OpenStreetMaps (OSM).
 
     Parameters
     ----------
     *args: Union[str, Tuple[float, float, float, float]]
-        The positional arguments. This accepts either a single string 'location' value, which must be recognized as a region in OSM. Otherwise, 4 float arguments are accepted as 'north, south, east, west', defining a box for the chosen region
-        
+        The positional arguments. This accepts either a single string 'location' value, which must be recognized as a region in OSM. Otherwise, 4 float arguments are accepted as 'north, south, east, west', defining a box for the chosen region. A HazardRegion can also be passed instead, so the OSM data is reused between functions
+
+    distance_m: bool, Optional
+        Toggle for the distance to be given in m to the nearest point on the river lines, calculated in the local UTM projection, instead of in degrees. Both measure to the nearest point on the river lines. Default = False
+
+    max_distance: float, Optional
+        The largest distance from a river searched, in m if distance_m is True and otherwise in degrees. Buildings further away are given a distance of NaN. Default = None, meaning there is no limit
+
+    engine: str, Optional
+        'vector' to find the nearest river with a spatial index, or 'raster' to draw the rivers on a grid and read each building's distance from a distance transform of it. The raster engine is faster for dense cities, and its distances are within one pixel diagonal (sqrt(dx**2 + dy**2) for pixels dx by dy) of the vector engine's distances to the river lines. Default = 'vector'
+
+    geotiff_path: str, Optional
+        For the raster engine, a geotiff in lat, lon (e.g. the DEM) whose pixel grid is used. Default = None
+
+    resolution: float, Optional
+        For the raster engine, the pixel size when no geotiff is given, in m if distance_m is True and otherwise in degrees. Default = None, meaning 10 m or 0.0001 degrees
         
     Returns
     -------
     buildings: geopandas.geodataframe.GeoDataFrame
-    	Geodataframe containing building information including location, geometreis, distance from river (m) and OSMid for each building
+    	Geodataframe containing building information including location, geometreis, distance from river (m), OSMid and the name and OSM id of the nearest river for each building
 
     This also returns a plot of the cumulative river plot with respect to distance. 
     
     """
+    #Buildings and rivers are downloaded together through a HazardRegion
+    if find_region(args) is None:
+        args = (HazardRegion(*args),)
+
     #River data loaded from other hazard module 
     r, p, bp = river_list(*args, buffer = 0.005)
     
     #Buildings
-    buildings = building_setup(*args)
+    buildings = building_centroids(*args)
 
-    buildings['centroid'] = (buildings['geometry'].to_crs(crs=3857).centroid).to_crs(crs=4326) 
-    coords_list = [(point.x, point.y) for point in buildings['centroid']] 
-    
-    
-    #Building location info 
-    
-    building_loc = buildings['centroid'] 
-    building_points = []
-    for i in list(range(len(building_loc))):
-        x, y = building_loc.iloc[i].xy
-        points = [Point(x, y) for x, y in zip(x, y)]
-        building_points = np.append(building_points, points)
-
-    #river location info
-    riv_points = []
-    for i in list(range(len(r['new geometry']))):
-        rx, ry  = r['new geometry'].iloc[i].xy   #At the moment on
-        points = [Point(x, y) for x, y in zip(rx, ry)]
-        riv_points = np.append(riv_points, points)
-         
-    #Calculating the distances. 
-    distance = []
-    
-    for i in range(len(building_points)):
-        p_index = building_points[i].distance(riv_points).argmin()
-        distance = np.append(distance, building_points[i].distance(riv_points[p_index]))
-    
-    buildings['distance degrees'] = distance
+    #Nearest river to each building, from one bulk query of a spatial index over the rivers, or a distance transform of the rivers drawn on a grid
+    network = river_network(*args, buffer = 0.005)
+    column, unit = ('distance m', 'm') if distance_m else ('distance degrees', 'degrees')
+    if engine == 'raster':
+        distance, nearest = raster_river_distance(buildings['centroid'], r, column = 'new geometry', geotiff_path = geotiff_path, resolution = resolution, units = unit)
+        if max_distance is not None:
+            nearest[distance > max_distance] = -1
+            distance[distance > max_distance] = np.nan
+    elif distance_m:
+        distance, nearest = nearest_river_m(buildings['centroid'], r, column = 'new geometry', max_distance = max_distance)
+    else:
+        distance, nearest = network.nearest_line(buildings['centroid'], max_distance = max_distance)
+    buildings[column] = distance
+    found = nearest >= 0
+    buildings['river name'] = np.where(found, network.names[nearest], None)
+    buildings['river id'] = np.where(found, network.ids[nearest], None)
 
 
     #Return a plot of the distances
-    max_dis = buildings['distance degrees'].max()
-    distance_bins = np.linspace(0, max_dis, 200)
-
-    building_count = []
-
-    for i in range(len(distance_bins) - 1):
-        count = len(buildings[(buildings['distance degrees'] >= distance_bins[i]) & 
-                                  (buildings['distance degrees'] < distance_bins[i + 1])]) #binning 
-        building_count.append(count)
-
-    
-    cum_building_count = np.cumsum(building_count)
+    curve = exposure_curve(buildings[column], bins = 199)
+    distance_bins = curve['lower'].to_numpy()
+    cum_building_count = curve['cumulative count'].to_numpy()
 
 
     #plt.figure(figsize = (10,6))
@@ -83,14 +85,14 @@ def building_dis(*args):
     
     
     fig, ax = plt.subplots(figsize=(10,6))
-    ax.plot(distance_bins[:-1], cum_building_count, linewidth = 3)
+    ax.plot(distance_bins, cum_building_count, linewidth = 3)
     
     
 # Set axis labels and title
-    ax.set_xlabel('distance in degrees from River')
+    ax.set_xlabel(f'distance in {unit} from River')
     ax.set_ylabel('cumulative building count')
     ax.set_ylim(0, max(cum_building_count) + 100)
-    ax.set_xlim(0, buildings['distance degrees'].max())
+    ax.set_xlim(0, buildings[column].max())
     
     plt.grid()
 # Display the plot
@@ -98,7 +100,7 @@ def building_dis(*args):
     plt.show()
     
     
-    return buildings[['geometry','centroid' ,'building', 'distance degrees']]
+    return buildings[['geometry','centroid' ,'building', column, 'river name', 'river id']]
     
     
     
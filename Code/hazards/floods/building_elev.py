@@ -1,8 +1,11 @@
 from ..third_party import Point, np, ox, rasterio
-from .elevation import river_elevation
-from .build_step import building_setup
+from .river_network import river_network
+from ..dem.sampler import RasterSampler
+from .build_step import building_centroids
+from ..region import HazardRegion, find_region, region_cache
 
-def building_elev(geotiff_path,*args):
+@region_cache('geotiff_path', 'resolution')
+def building_elev(geotiff_path,*args, resolution = None):
     """
     Returns building information for each building in a given region. This includes the geometries, centroid locations, absolute elevation and relative elevation. This building information has been extracted from OpenStreetMaps (OSM).
 
@@ -11,7 +14,9 @@ def building_elev(geotiff_path,*args):
     geotiff_path : str
         This should be the str name of a downloaded geotiff of elevation data that covers the chosen region.
     *args: Union[str, Tuple[float, float, float, float]]
-        The positional arguments. This accepts either a single string 'location' value, which must be recognized as a region in OSM. Otherwise, 4 float arguments are accepted as 'north, south, east, west', defining a box for the chosen region
+        The positional arguments. This accepts either a single string 'location' value, which must be recognized as a region in OSM. Otherwise, 4 float arguments are accepted as 'north, south, east, west', defining a box for the chosen region. A HazardRegion can also be passed instead, so the OSM data is reused between functions
+    resolution: float, Optional
+        The DEM pixel size in metres that is good enough. The elevations are read from the coarsest overview of the geotiff that meets it (see build_overviews). Default = None, meaning the full resolution
         
         
     Returns
@@ -21,57 +26,32 @@ def building_elev(geotiff_path,*args):
     
     This also returns a pie plot and a bar chart collectively showing the m+n (Default 29) largest building classifications within the given buffer of the rivers within that region
     """
+    #Buildings and rivers are downloaded together through a HazardRegion
+    if find_region(args) is None:
+        args = (HazardRegion(*args),)
+
     #River data loaded from other hazard module 
-    r = river_elevation(geotiff_path, *args, buffer = 0.005)
+    network = river_network(*args, buffer = 0.005, geotiff_path = geotiff_path, resolution = resolution)
     
     #building information from .build_step
-    buildings = building_setup(*args)
-
     #Centroid building to allow for elevtation to be calculated
-    buildings['centroid'] = (buildings['geometry'].to_crs(crs=3857).centroid).to_crs(crs=4326) 
-    coords_list = [(point.x, point.y) for point in buildings['centroid']] 
-    
-    #Devermine elevation of buildings
-    elev = []
+    buildings = building_centroids(*args)
     
-    with rasterio.open(geotiff_path) as src:
-        vals = src.sample(coords_list)
-        for val in vals:
-            elev.append(val[0])
-    buildings['elevation'] = elev
+    #Devermine elevation of buildings, with the same sampler as the river vertices
+    buildings['elevation'] = RasterSampler(geotiff_path, resolution = resolution).sample(np.column_stack([buildings['centroid'].x, buildings['centroid'].y]))
     
     
-    #Building location info 
-    building_loc = buildings['centroid'] 
-    building_points = []
-    for i in list(range(len(building_loc))):
-        x, y = building_loc.iloc[i].xy
-        points = [Point(x, y) for x, y in zip(x, y)]
-        building_points = np.append(building_points, points)
-
-    #river location and elevation info
-    riv_points = []
-    riv_elev = []
-    for i in list(range(len(r['new geometry']))):
-        rx, ry  = r['new geometry'].iloc[i].xy
-        elev = r['elevations'].iloc[i]
-        points = [Point(x, y) for x, y in zip(rx, ry)]
-        riv_points = np.append(riv_points, points)
-        riv_elev = np.append(riv_elev, elev)
-        
-    #Calculating relative elevation of the buildings 
-    buildings['relative elevation'] = None
-
-    for i in range(len(building_points)):
-        p_index = building_points[i].distance(riv_points).argmin()
-        elevation = riv_elev[p_index]
-        rel_elev = buildings['elevation'].iloc[i] - elevation
-        buildings['relative elevation'].iloc[i] = rel_elev         
+    #Relative elevation of each building to its nearest river vertex, from one bulk query of a spatial index over the vertices
+    distance, vertex, nearest = network.nearest(buildings['centroid'])
+    found = vertex >= 0
+    rel_elev = np.full(len(buildings), np.nan)
+    rel_elev[found] = buildings['elevation'].to_numpy(dtype = float)[found] - network.elevation[vertex[found]]
+    buildings['relative elevation'] = rel_elev
     
     buildings = buildings[['geometry','centroid' ,'building', 'elevation', 'relative elevation']]
     
     #Removes anomalies which return as ~-30,000 30,000 elevation. 
-    buildings = buildings[(buildings['relative elevation'] >= -100) & (buildings['relative elevation'] <= 1000)]
+    buildings = buildings[(rel_elev >= -100) & (rel_elev <= 1000)]
     
     return buildings
     
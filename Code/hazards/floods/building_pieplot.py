@@ -1,5 +1,8 @@
 from ..third_party import np, ox, pd, plt
+from ..osm.features import features_from_place
 from .build_step import building_setup
+from ..building_types import building_type_counts, building_type_split, plot_building_types
+from ..region import HazardRegion
 
 
 def building_pie_func(*args, n = 9, m = 20):
@@ -9,7 +12,7 @@ def building_pie_func(*args, n = 9, m = 20):
     Parameters
     ----------
     *args: Union[str, Tuple[float, float, float, float]]
-        The positional arguments. This accepts either a single string 'location' value, which must be recognized as a region in OSM. Otherwise, 4 float arguments are accepted as 'north, south, east, west', defining a box for the chosen region
+        The positional arguments. This accepts either a single string 'location' value, which must be recognized as a region in OSM. Otherwise, 4 float arguments are accepted as 'north, south, east, west', defining a box for the chosen region. A HazardRegion can also be passed instead, so the OSM data is reused between functions
     
     n: float, Optional
     	n is the number of categories portrayed on the piechart. This will be the largest n categories of building classifications. The pie chart will then compile an 'other' categories for the remaining building types. Default = 9
@@ -27,38 +30,14 @@ def building_pie_func(*args, n = 9, m = 20):
     #Extract building information
     buildings = building_setup(*args)
        
-    #remove nan values, and seperate values into pieplot and bar chart
+    #remove nan values, and seperate values into pieplot and bar chart from one count of the building types
     b = buildings['building'].dropna(how='all')
-    pie = [[],[]]
-    for i in range(len(b.unique())):
-        s = b.str.contains(b.unique()[i]).sum()
-        pie[0] = np.append(pie[0], b.unique()[i]) #This is creating the pie chart dataset for each 
-        pie[1] = np.append(pie[1], s) 
-    data = pd.DataFrame(pie).T
-    data_asc = data[1:].sort_values([1], ascending=[False])
-    print('number of yes', data_asc[data_asc[0] == 'yes'].count())
-    data_asc = data_asc[data_asc[0] != 'yes']
-    data_asc = data_asc[data_asc[0] != 'no']
-    
-    data_asc_top = data_asc[:n].set_index(0)
-    data_asc_bot = data_asc[n+1:n+1+m] #Set the no. of values in piechart and barchart
-    
-    data_asc_top.loc[len(data_asc_top.index)] = [data_asc_bot[1].sum()] 
-    data_asc_top = data_asc_top.rename(index={n: 'Other'})
+    print('number of yes', (b == 'yes').sum())
+    pie, bar = building_type_split(building_type_counts(b), n = n, m = m)
     
     
     #Plot the figure:
-    fig, ax = plt.subplots(1, 2, figsize=(15, 8))
-
-    plt.subplot(1, 2, 1) 
-    plt.pie(data_asc_top[1], labels =data_asc_top.index, colors = plt.cm.tab10(np.arange(10)))
-    plt.title('10 Key Building Types')
-    
-    plt.subplot(1, 2, 2) 
-    plt.bar(data_asc_bot[0], data_asc_bot[1], color= plt.cm.tab10(n))
-    plt.xticks(rotation=90)
-    plt.grid(linestyle = "dashed" , alpha = 0.5)
-    plt.title('Other Building Types')
+    plot_building_types(pie, bar, n, '10 Key Building Types')
     
     plt.savefig('bar_chart.png')
     
@@ -72,7 +51,7 @@ def building_pieplot(*args, n = 9, m = 20):
     Parameters
     ----------
     *args: Union[str, Tuple[float, float, float, float]]
-        The positional arguments. This accepts either a single string 'location' value, which must be recognized as a region in OSM. Otherwise, 4 float arguments are accepted as 'north, south, east, west', defining a box for the chosen region
+        The positional arguments. This accepts either a single string 'location' value, which must be recognized as a region in OSM. Otherwise, 4 float arguments are accepted as 'north, south, east, west', defining a box for the chosen region. A HazardRegion can also be passed instead, so the OSM data is reused between functions
     
     n: float, Optional
     	n is the number of categories portrayed on the piechart. This will be the largest n categories of building classifications. The pie chart will then compile an 'other' categories for the remaining building types. Default = 9
@@ -88,10 +67,12 @@ def building_pieplot(*args, n = 9, m = 20):
     
     """
     tags = {'waterway': 'river'} 
-    if len(args) == 1:
+    if len(args) == 1 and isinstance(args[0], HazardRegion):
+        building_pie_func(args[0], n = n, m = m)
+    elif len(args) == 1:
         name = args[0]
         try:
-            buildings = ox.features_from_place(name, tags={'building': True, })
+            buildings = features_from_place(name, tags={'building': True, })
         except Exception as e:
             print(f'{e}')
             print(f'To find appropriate location names go to https://www.openstreetmap.org/')
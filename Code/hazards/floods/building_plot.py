@@ -1,4 +1,7 @@
 from ..third_party import ox, plt
+from ..osm.features import features_from_bbox, features_from_place
+from ..region import HazardRegion
+from .build_step import building_setup
 
 from typing import Union, Tuple
 
@@ -8,7 +11,16 @@ def building_func(*args):
     if len(args) == 1 and isinstance(args[0], str):  # If a location has been called
         name = args[0]
         print(f'Processing plot: {name}')
-        buildings = ox.features_from_place(name, tags=tags)
+        buildings = features_from_place(name, tags=tags)
+        x_min, y_min, x_max, y_max = buildings['geometry'].total_bounds
+        difference = ( x_max - x_min ) / ( y_max - y_min )
+        buildings.plot(figsize = (10,10*difference))
+        plt.show()
+        
+        plt.savefig('buildings.png')
+        
+    elif len(args) == 1 and isinstance(args[0], HazardRegion):  # If a HazardRegion has been called
+        buildings = building_setup(args[0])
         x_min, y_min, x_max, y_max = buildings['geometry'].total_bounds
         difference = ( x_max - x_min ) / ( y_max - y_min )
         buildings.plot(figsize = (10,10*difference))
@@ -18,7 +30,7 @@ def building_func(*args):
         
     elif len(args) == 4:  # If a box has been called
         print('Processing lat long grid')
-        buildings = ox.features_from_bbox(args[0], args[1], args[2], args[3], tags=tags)  # north, south, east, west
+        buildings = features_from_bbox(args[0], args[1], args[2], args[3], tags=tags)  # north, south, east, west
         x_min, y_min, x_max, y_max = buildings['geometry'].total_bounds
         difference = ( x_max - x_min ) / ( y_max - y_min )
         buildings.plot(figsize = (10,10*difference))
@@ -37,7 +49,7 @@ def building_plot(*args):
     Parameters
     ----------
     *args: Union[str, Tuple[float, float, float, float]]
-        The positional arguments. This accepts either a single string 'location' value, which must be recognized as a region in OSM. Otherwise, 4 float arguments are accepted as 'north, south, east, west', defining a box for the chosen region
+        The positional arguments. This accepts either a single string 'location' value, which must be recognized as a region in OSM. Otherwise, 4 float arguments are accepted as 'north, south, east, west', defining a box for the chosen region. A HazardRegion can also be passed instead, so the OSM data is reused between functions
 
     Returns
     -------
@@ -48,10 +60,12 @@ def building_plot(*args):
     Example: hazards.building_plot('Exeter')
     """
     tags = {'waterway': 'river'}
-    if len(args) == 1:
+    if len(args) == 1 and isinstance(args[0], HazardRegion):
+        building_func(args[0])
+    elif len(args) == 1:
         name = args[0]
         try:
-            buildings = ox.features_from_place(name, tags={'building': True})
+            buildings = features_from_place(name, tags={'building': True})
         except Exception as e:
             print(f'{e}')
             print('To find appropriate location names go to https://www.openstreetmap.org/') #Link to OSM
@@ -1,8 +1,11 @@
 from ..third_party import rasterio, pd, MultiLineString, LineString
+from .river_network import RiverNetwork
 from .river_data import river_data
+from ..region import region_cache
 
 
-def river_elevation(geotiff_path, *args, buffer=None, print_list = True):
+@region_cache('geotiff_path', 'buffer', 'resolution')
+def river_elevation(geotiff_path, *args, buffer=None, print_list = True, resolution = None):
     """
     Get rivers within the given region (box or area) through OpenStreetMaps (OSM), their names, geometries,
     reduced geometries based on the size of the buffer for the region, km distances for the reduced geometries
@@ -16,12 +19,16 @@ def river_elevation(geotiff_path, *args, buffer=None, print_list = True):
     *args : Union[str, Tuple[float, float, float, float]]
         The positional arguments. This accepts either a single string 'location' value, which must be recognized as
         a region in OSM. Otherwise, 4 float arguments are accepted as 'north, south, east, west', defining a box for
-        the chosen region.
+        the chosen region. A HazardRegion can also be passed instead, so the OSM data is reused between functions.
 
     buffer : float, optional
         Description of the buffer. If provided, it represents the degree distance buffer at which to remove
         additional river data. Default is None.
 
+    resolution : float, optional
+        The DEM pixel size in metres that is good enough. The elevations are read from the coarsest overview of the
+        geotiff that meets it (see build_overviews). Default is None, meaning the full resolution.
+
     Returns
     -------
     river : geopandas.geodataframe.GeoDataFrame
@@ -30,48 +37,16 @@ def river_elevation(geotiff_path, *args, buffer=None, print_list = True):
         lon location 0,0 for these reduced geometries, and the elevations.
     """
     
-    #Take river info and calculate elevation from the geotiff file 
+    #Take river info and calculate elevation from the geotiff file, for every vertex of every river in one pass
     if buffer is None:
         r, polygon = river_data(*args, print_list = print_list)
-        r['elevations'] = None
-        for i in range(len(r)):
-            riv = r.loc[r.index[i], 'geometry']
-            if isinstance(riv, LineString):
-                coords_list = list(riv.coords)
-            elif isinstance(riv, MultiLineString):
-                coords_list = [list(line.coords) for line in riv.geoms]
-
-		#Calculate elevation
-            elev = []
-            
-            with rasterio.open(geotiff_path) as src:
-                vals = src.sample(coords_list)
-                for val in vals:
-                    elev.append(val[0])
-
-            r.at[r.index[i], 'elevations'] = elev
-
-        return r
+        network = RiverNetwork(r)
     else:
+        # This uses cut rivers instead of non cut one.
         r, polygon, buffered_polygon = river_data(*args, buffer=buffer, print_list = print_list)
-        r['elevations'] = None
-
-        # This uses cut rivers instead of non cut one. Calculates same as above. 
-        for i in range(len(r)):
-            riv = r.loc[r.index[i], 'new geometry']
-            if isinstance(riv, LineString):
-                coords_list = list(riv.coords)
-            elif isinstance(riv, MultiLineString):
-                coords_list = [list(line.coords) for line in riv.geoms]
-
-
-            elev = []
-
-            with rasterio.open(geotiff_path) as src:
-                vals = src.sample(coords_list)
-                for val in vals:
-                    elev.append(val[0])
-
-            r.at[r.index[i], 'elevations'] = elev
+        network = RiverNetwork(r, column = 'new geometry')
 
-        return r
+    network.attach_elevation(geotiff_path, resolution = resolution)
+    #One flat list of elevations per river, also for MultiLineStrings
+    r['elevations'] = [list(elev) for elev in network.split(network.elevation)]
+    return r
@@ -0,0 +1,58 @@
+from ..third_party import np, pd
+
+
+def exposure_curve(distances, bins = 200, spacing = 'linear', groups = None):
+    """
+    Return the number of buildings in each distance bin and the cumulative number of buildings within each distance, e.g. from the rivers. The counts are found in one pass over the distances, for any number of bins.
+
+    Parameters
+    ----------
+    distances: Union[pandas.core.series.Series, numpy.ndarray]
+        The distance of each building, e.g. the 'distance degrees' or 'distance m' column from building_dis. NaN distances are left out
+    bins: Union[int, list], Optional
+        The number of bins, or the bin edges. Default = 200
+    spacing: str, Optional
+        How the bin edges are placed when bins is a number. 'linear' for equal widths from 0 to the largest distance, 'quantile' for an equal number of buildings in each bin, or 'log' for widths increasing with distance (the first bin starts at 0). Default = 'linear'
+    groups: Union[pandas.core.series.Series, numpy.ndarray], Optional
+        A label for each building, e.g. the 'building' type column, to count separately. Default = None
+
+    Returns
+    -------
+    curve: pandas.core.frame.DataFrame
+        The lower and upper edge of each bin, the number of buildings in it and the cumulative number of buildings up to its upper edge
+    by_group: pandas.core.frame.DataFrame, Optional
+        If groups is given, the cumulative number of buildings up to the upper edge of each bin, with a column per group
+
+    Example: buildings = hazards.building_dis('Peebles')
+             curve, by_type = hazards.exposure_curve(buildings['distance degrees'], bins = 50, spacing = 'log', groups = buildings['building'])
+    """
+    distances = np.asarray(distances, dtype = float)
+    keep = ~np.isnan(distances)
+    distances = distances[keep]
+
+    if np.ndim(bins) == 0:
+        if len(distances) == 0:
+            edges = np.linspace(0, 1, bins + 1)
+        elif spacing == 'quantile':
+            edges = np.unique(np.quantile(distances, np.linspace(0, 1, bins + 1)))
+        elif spacing == 'log':
+            smallest = distances[distances > 0].min() if (distances > 0).any() else 1
+            edges = np.geomspace(smallest, max(distances.max(), smallest * 10), bins + 1)
+            edges[0] = 0
+        else:
+            edges = np.linspace(0, distances.max(), bins + 1)
+    else:
+        edges = np.asarray(bins, dtype = float)
+
+    counts, edges = np.histogram(distances, bins = edges)
+    curve = pd.DataFrame({'lower': edges[:-1], 'upper': edges[1:], 'count': counts, 'cumulative count': np.cumsum(counts)})
+    if groups is None:
+        return curve
+
+    #Bin and group of every building, counted together with one bincount
+    labels, codes = np.unique(np.asarray(groups, dtype = str)[keep], return_inverse = True)
+    bin_index = np.clip(np.searchsorted(edges, distances, side = 'right') - 1, 0, len(counts) - 1)
+    inside = (distances >= edges[0]) & (distances <= edges[-1])
+    grouped = np.bincount(codes[inside] * len(counts) + bin_index[inside], minlength = len(labels) * len(counts))
+    by_group = pd.DataFrame(np.cumsum(grouped.reshape(len(labels), len(counts)), axis = 1).T, columns = labels)
+    return curve, by_group
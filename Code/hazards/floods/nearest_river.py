@@ -0,0 +1,57 @@
+from ..third_party import np, gpd, shapely, STRtree
+
+
+def nearest_vertex(points, coords, max_distance = None, tree = None):
+    """
+    Return the distance in degrees from each point to the nearest of a set of vertices, and the position of that vertex in coords (-1 if none is within max_distance). A spatial index (STRtree) is built once over the vertices, unless one is passed as tree (e.g. RiverNetwork.vertex_tree), and all the points are looked up in one bulk query.
+    """
+    distance = np.full(len(points), np.nan)
+    vertex = np.full(len(points), -1)
+    if len(coords) == 0 or len(points) == 0:
+        return distance, vertex
+    if tree is None:
+        tree = STRtree(shapely.points(coords))
+    (point_index, vertex_index), found = tree.query_nearest(np.asarray(points), max_distance = max_distance, return_distance = True, all_matches = False)
+    distance[point_index] = found
+    vertex[point_index] = vertex_index
+    return distance, vertex
+
+def nearest_river_m(points, rivers, column = 'geometry', max_distance = None):
+    """
+    Return the distance in metres from each point to the nearest point on any river line (not only its vertices), and which river that is. The points and rivers are projected once to the local UTM zone and matched with one nearest spatial join.
+
+    Parameters
+    ----------
+    points: geopandas.geoseries.GeoSeries
+        The points, e.g. the building centroids, in lat, lon
+    rivers: geopandas.geodataframe.GeoDataFrame
+        The rivers, e.g. from river_list
+    column: str, Optional
+        The column of rivers holding the river geometries. Default = 'geometry', use 'new geometry' for the rivers cut to a buffer
+    max_distance: float, Optional
+        The largest distance in m searched. Points further than this from every river are skipped and given a distance of NaN. Default = None, meaning there is no limit
+
+    Returns
+    -------
+    distance: numpy.ndarray
+        The distance in m from each point to the nearest river
+    river_index: numpy.ndarray
+        The position (row number) in rivers of the nearest river to each point, or -1 if none is within max_distance
+    """
+    distance = np.full(len(points), np.nan)
+    river_index = np.full(len(points), -1)
+    lines = gpd.GeoSeries(np.asarray(rivers[column]), crs = 'EPSG:4326')
+    lines = lines[lines.notna() & ~lines.is_empty]
+    if len(lines) == 0 or len(points) == 0:
+        return distance, river_index
+
+    points = gpd.GeoSeries(np.asarray(points), crs = points.crs if points.crs is not None else 'EPSG:4326')
+    crs = points.estimate_utm_crs()
+    left = gpd.GeoDataFrame(geometry = points.to_crs(crs).reset_index(drop = True))
+    right = gpd.GeoDataFrame({'river_index': lines.index}, geometry = lines.to_crs(crs).values)
+    joined = gpd.sjoin_nearest(left, right, how = 'inner', max_distance = max_distance, distance_col = 'distance')
+    #Points at the same distance from two rivers appear twice
+    joined = joined[~joined.index.duplicated(keep = 'first')]
+    distance[joined.index] = joined['distance']
+    river_index[joined.index] = joined['river_index']
+    return distance, river_index
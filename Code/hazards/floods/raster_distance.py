@@ -0,0 +1,84 @@
+from ..third_party import np, gpd, rasterio, rasterize, distance_transform_edt
+
+
+def _grid(bounds, geotiff_path, resolution):
+    #The (transform, shape) of a grid covering bounds, with its pixels aligned to the geotiff or of size resolution
+    minx, miny, maxx, maxy = bounds
+    if geotiff_path is not None:
+        with rasterio.open(geotiff_path) as src:
+            a, e, c, f = src.transform.a, src.transform.e, src.transform.c, src.transform.f
+            if src.crs is not None and not src.crs.is_geographic:
+                print('CAUTION: The geotiff is not in lat, lon, so its pixel grid is not used for the river distances')
+                a, e, c, f = resolution, -resolution, 0.0, 0.0
+    else:
+        a, e, c, f = resolution, -resolution, 0.0, 0.0
+    #Whole pixels of the (possibly infinite) grid that cover the bounds, with one pixel to spare on each side
+    col0 = int(np.floor((minx - c) / a)) - 1
+    col1 = int(np.ceil((maxx - c) / a)) + 1
+    row0 = int(np.floor((maxy - f) / e)) - 1
+    row1 = int(np.ceil((miny - f) / e)) + 1
+    transform = rasterio.Affine(a, 0, c + col0 * a, 0, e, f + row0 * e)
+    return transform, (row1 - row0, col1 - col0)
+
+
+def raster_river_distance(points, rivers, column = 'geometry', geotiff_path = None, resolution = None, units = 'degrees'):
+    """
+    Return the distance from each point to the nearest river using a raster distance transform. The rivers are drawn onto a grid, a Euclidean distance transform gives the distance of every pixel from the nearest river pixel once, and each point then reads the value of its pixel.
+
+    The distances are within one pixel diagonal, sqrt(dx**2 + dy**2) for pixels of size dx by dy, of the true distance to the river lines (as given by RiverNetwork.nearest_line and nearest_river_m): a point can be up to half a diagonal from the centre of its pixel, and the river up to half a diagonal from the centre of the pixels it is drawn on.
+
+    Parameters
+    ----------
+    points: geopandas.geoseries.GeoSeries
+        The points, e.g. the building centroids, in lat, lon
+    rivers: geopandas.geodataframe.GeoDataFrame
+        The rivers, e.g. from river_list
+    column: str, Optional
+        The column of rivers holding the river geometries. Default = 'geometry', use 'new geometry' for the rivers cut to a buffer
+    geotiff_path: str, Optional
+        A geotiff (e.g. the DEM) whose pixel grid is used. Only used when units is 'degrees' and the geotiff is in lat, lon. Default = None
+    resolution: float, Optional
+        The pixel size of the grid, in units, used when no geotiff is given. Default = None, meaning 0.0001 degrees or 10 m
+    units: str, Optional
+        'degrees' for a grid and distances in lat, lon, or 'm' for a grid and distances in metres in the local UTM projection. Default = 'degrees'
+
+    Returns
+    -------
+    distance: numpy.ndarray
+        The distance from each point to the nearest river
+    river_index: numpy.ndarray
+        The position (row number) in rivers of the nearest river to each point, or -1 if there are no rivers
+    """
+    if distance_transform_edt is None:
+        raise ImportError('scipy is needed for the raster distance engine: pip install scipy')
+
+    distance = np.full(len(points), np.nan)
+    river_index = np.full(len(points), -1)
+    points = gpd.GeoSeries(np.asarray(points), crs = 'EPSG:4326')
+    lines = gpd.GeoSeries(np.asarray(rivers[column]), crs = 'EPSG:4326')
+    present = (lines.notna() & ~lines.is_empty).to_numpy()
+    if not present.any() or len(points) == 0:
+        return distance, river_index
+
+    if units == 'm':
+        crs = points.estimate_utm_crs()
+        points, lines = points.to_crs(crs), lines.to_crs(crs)
+        geotiff_path = None
+        resolution = 10.0 if resolution is None else resolution
+    else:
+        resolution = 0.0001 if resolution is None else resolution
+
+    minx, miny, maxx, maxy = points.total_bounds
+    rminx, rminy, rmaxx, rmaxy = lines[present].total_bounds
+    transform, shape = _grid((min(minx, rminx), min(miny, rminy), max(maxx, rmaxx), max(maxy, rmaxy)), geotiff_path, resolution)
+
+    #Each river is drawn with its row number + 1, so the nearest river pixel also gives the nearest river
+    labels = rasterize([(line, i + 1) for i, line in enumerate(lines) if present[i]], out_shape = shape, transform = transform, all_touched = True, fill = 0, dtype = 'int32')
+    pixel_distance, (rows, cols) = distance_transform_edt(labels == 0, sampling = (abs(transform.e), abs(transform.a)), return_indices = True)
+
+    #O(1) lookup of the pixel under each point
+    row = np.floor((points.y.to_numpy() - transform.f) / transform.e).astype(int)
+    col = np.floor((points.x.to_numpy() - transform.c) / transform.a).astype(int)
+    distance = pixel_distance[row, col]
+    river_index = labels[rows[row, col], cols[row, col]] - 1
+    return distance, river_index
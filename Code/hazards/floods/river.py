@@ -1,5 +1,10 @@
 from ..third_party import ox, np, Polygon
+from ..osm.features import features_from_place
+from ..osm.boundary import region_boundary
+from ..osm.tiles import features_from_bbox_tiled
+from ..region import region_cache
 
+@region_cache(base = True)
 def river(*args, print_list = False): #, buffer = None):
     """
     Get rivers within the given region (box or area) through OpenStreetMaps (OSM), returning all rivers that intersect the chosen region as well as the Polygon of the region chosen
@@ -7,7 +12,7 @@ def river(*args, print_list = False): #, buffer = None):
     Parameters
     ----------
     *args: Union[str, Tuple[float, float, float, float]]
-    	The positional arguments. This accepts either a single string 'location' value, which must be recognised as a region in OSM. Otherwise 4 float arguements are accepted as 'north, south, east, west', defining a box for the chosen region
+    	The positional arguments. This accepts either a single string 'location' value, which must be recognised as a region in OSM. Otherwise 4 float arguements are accepted as 'north, south, east, west', defining a box for the chosen region. A HazardRegion can also be passed instead, so the OSM data is reused between functions
     		
     Returns 
     -------
@@ -24,10 +29,9 @@ def river(*args, print_list = False): #, buffer = None):
     if len(args) == 1 and isinstance(args[0], str):
         name = args[0]
         print(f'Processing rivers in: {name}')
-        geometries = ox.features_from_place(name, tags=tags)
+        geometries = features_from_place(name, tags=tags)
         
-        shape = ox.features_from_place(name, tags={'name': name})
-        polygon = shape.unary_union #Calculate polygon on the region. 
+        polygon = region_boundary(name) #Polygon of the region, from the gazetteer cache 
                 
         if len(geometries) == 0:
             print(f'No rivers found in {name}')
@@ -36,7 +40,7 @@ def river(*args, print_list = False): #, buffer = None):
             river_data.append((name, geometries))
     elif len(args) == 4:
         print('Processing rivers in lat long grid')
-        geometries = ox.features_from_bbox(args[0], args[1], args[2], args[3], tags=tags)
+        geometries = features_from_bbox_tiled(args[0], args[1], args[2], args[3], tags=tags)
         
         polygon= Polygon([(args[3],args[1]),(args[3],args[0]),(args[2],args[0]),(args[2],args[1])])
         
@@ -0,0 +1,83 @@
+from ..third_party import np, gpd, pd, shapely, STRtree
+from .river_list import river_list
+from .build_step import building_setup
+from ..region import HazardRegion, find_region, region_cache
+from ..building_types import building_type_table
+
+
+@region_cache('river_cutoff', 'units')
+def building_river_distance(*args, river_cutoff = 0.005, units = 'degrees'):
+    """
+    Return the buildings of a region with the distance from each building outline to the nearest river line. A building is within distance d of the rivers exactly when it intersects the river buffer of size d, so the same distance answers every buffer size.
+
+    Parameters
+    ----------
+    *args: Union[str, Tuple[float, float, float, float]]
+        The positional arguments. This accepts either a single string 'location' value, which must be recognized as a region in OSM. Otherwise, 4 float arguments are accepted as 'north, south, east, west', defining a box for the chosen region. A HazardRegion can also be passed instead, so the OSM data is reused between functions
+    river_cutoff: float, Optional
+        The degree distance outside of the region after which the river points are dropped, as in river_buffer. Default = 0.005 degrees
+    units: str, Optional
+        'degrees' for distances in lat, lon, or 'm' for distances in metres in the local UTM projection. Default = 'degrees'
+
+    Returns
+    -------
+    buildings: geopandas.geodataframe.GeoDataFrame
+        The buildings from building_setup with a 'river distance' column (NaN if there are no rivers)
+    """
+    river, polygon, buffered_polygon = river_list(*args, buffer = river_cutoff, print_list = False)
+    buildings = building_setup(*args)
+
+    lines = gpd.GeoSeries(river['new geometry'].values, crs = 'EPSG:4326')
+    lines = lines[lines.notna() & ~lines.is_empty]
+    outlines = buildings['geometry']
+    if units == 'm':
+        crs = outlines.estimate_utm_crs()
+        lines, outlines = lines.to_crs(crs), outlines.to_crs(crs)
+
+    distance = np.full(len(buildings), np.nan)
+    if len(lines) != 0 and len(buildings) != 0:
+        (building_index, line_index), found = STRtree(lines.values).query_nearest(outlines.values, return_distance = True, all_matches = False)
+        distance[building_index] = found
+    buildings['river distance'] = distance
+    return buildings
+
+
+def river_bands(*args, edges = (0, 0.001, 0.003, 0.005), river_cutoff = 0.005, units = 'degrees'):
+    """
+    Return the number of buildings of each type in several distance bands around the rivers of a region, e.g. 0 to 0.001, 0.001 to 0.003 and 0.003 to 0.005 degrees. Each building's distance from the rivers is calculated once and every building is placed in its band in one step, instead of calling buffered_piechart for each band.
+
+    Parameters
+    ----------
+    *args: Union[str, Tuple[float, float, float, float]]
+        The positional arguments. This accepts either a single string 'location' value, which must be recognized as a region in OSM. Otherwise, 4 float arguments are accepted as 'north, south, east, west', defining a box for the chosen region. A HazardRegion can also be passed instead, so the OSM data is reused between functions
+    edges: list, Optional
+        The increasing edges of the bands. A building at distance d from the rivers is in the band edges[i] < d <= edges[i + 1], and the first band also holds the buildings touching a river. Default = (0, 0.001, 0.003, 0.005)
+    river_cutoff: float, Optional
+        The degree distance outside of the region after which the river points are dropped. Default = 0.005 degrees
+    units: str, Optional
+        The units of edges, 'degrees' or 'm'. Default = 'degrees'
+
+    Returns
+    -------
+    table: pandas.core.frame.DataFrame
+        The number of buildings of each building classification (columns) in each band (rows). Buildings further than the last edge are not counted
+    buildings: geopandas.geodataframe.GeoDataFrame
+        The buildings with their 'river distance' and 'band'
+
+    Example: table, buildings = hazards.river_bands('Peebles', edges = [0, 50, 100, 250, 500], units = 'm')
+    """
+    #The distances are stored on the region, so other band edges do not calculate them again
+    if find_region(args) is None:
+        args = (HazardRegion(*args),)
+    buildings = building_river_distance(*args, river_cutoff = river_cutoff, units = units)
+
+    edges = np.asarray(edges, dtype = float)
+    labels = [f'{edges[i]:g}-{edges[i + 1]:g}' for i in range(len(edges) - 1)]
+    #Right closed bands, as a building at exactly the buffer distance intersects the buffer
+    band = np.digitize(buildings['river distance'].to_numpy(), edges, right = True) - 1
+    band[buildings['river distance'].to_numpy() == edges[0]] = 0
+    inside = (band >= 0) & (band < len(labels))
+    buildings['band'] = pd.Categorical.from_codes(np.where(inside, band, -1), categories = labels)
+
+    table = building_type_table(buildings['band'].array, buildings['building'], exclude = ())
+    return table, buildings
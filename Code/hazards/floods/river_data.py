@@ -1,8 +1,11 @@
-from ..third_party import pd, np, LineString, MultiLineString 
+from ..third_party import pd, np, shapely, LineString, MultiLineString 
 from .river_list import river_list
 from ..conversion import conversion
+from .river_network import RiverNetwork
+from ..region import region_cache
 
 
+@region_cache('buffer')
 def river_data(*args, buffer=None, print_list = True):
     """
     Returns the river node locations for a given location on the globe determined from OpenStreetMap (OSM) data. This should include the river name, OSM node, lat/lon locations, the lat/lon locations that fall in the chosen buffer region, and the km distances of each location with respect to lat, lon 0,0.
@@ -10,7 +13,7 @@ def river_data(*args, buffer=None, print_list = True):
     Parameters
     ----------
     *args: Union[str, Tuple[float, float, float, float]]
-    	The positional arguments. This accepts either a single string 'location' value, which must be recognised as a region in OSM. Otherwise 4 float arguements are accepted as 'north, south, east, west', defining a box for the chosen region
+    	The positional arguments. This accepts either a single string 'location' value, which must be recognised as a region in OSM. Otherwise 4 float arguements are accepted as 'north, south, east, west', defining a box for the chosen region. A HazardRegion can also be passed instead, so the OSM data is reused between functions
     	
     buffer: float, optional
     	Description of the buffer. If provided, it represents the degree distance buffer at which to remove additional river data. Default to None.
@@ -31,33 +34,18 @@ def river_data(*args, buffer=None, print_list = True):
     else:
         river, polygon, buffer_polygon = river_list(*args, buffer=buffer, print_list = print_list)
         
-    river['km distances'] = None
+    #All vertices of all rivers are converted to km distances from some reference point in one pass.
+    network = RiverNetwork(river, column = 'geometry' if buffer is None else 'new geometry')
+    distances_km = conversion(network.coords)
 
-	#Extract the geometries of the river locations. 
-    for j in range(len(river)):
-        if buffer is None:
-            geom = river.loc[river.index[j], 'geometry']
-        else:
-            geom = river.loc[river.index[j], 'new geometry']
-	#Create x,y locations to find the km distances from some reference point.
-        if isinstance(geom, LineString):
-            x, y = geom.xy
-        elif isinstance(geom, MultiLineString):
-            x, y = [], []
-            for line in geom.geoms:  # Use geoms 
-                xx, yy = line.xy
-                x.extend(xx)
-                y.extend(yy)
-
-	#Calculates km distances. (Place holder)
-        distances_km = []
-        for i in range(len(x)):
-            dis = conversion(x[i], y[i])
-            distances_km = np.append(distances_km, dis)
-        coordinates = [(distances_km[i], distances_km[i + 1]) for i in range(0, len(distances_km), 2)]
- 
-        line = LineString(coordinates)
-        river.at[river.index[j], 'km distances'] = line
+    #One LineString per river (the parts of a MultiLineString are joined, as before). Rivers with fewer than 2 vertices are left empty.
+    counts = np.diff(network.vertex_offsets)
+    lines = np.array([LineString()] * len(river), dtype = object)
+    keep = counts >= 2
+    if keep.any():
+        vertices = np.repeat(keep, counts)
+        lines[keep] = shapely.linestrings(distances_km[vertices], indices = np.repeat(np.arange(keep.sum()), counts[keep]))
+    river['km distances'] = lines
 
     if buffer is None:
         return river, polygon
@@ -1,6 +1,8 @@
 from ..third_party import np, Polygon, ox
 from .river import river
+from ..region import region_cache
 
+@region_cache('buffer')
 def river_list(*args, buffer = None, print_list = True):
     """
     Get rivers within the given region (box or area) through OpenStreetMaps (OSM), returning the rivers within the given buffer, the polygon of the given region and the polygon of the buffered region.
@@ -8,7 +10,7 @@ def river_list(*args, buffer = None, print_list = True):
     Parameters
     ----------
     *args: Union[str, Tuple[float, float, float, float]]
-    	The positional arguments. This accepts either a single string 'location' value, which must be recognised as a region in OSM. Otherwise 4 float arguements are accepted as 'north, south, east, west', defining a box for the chosen region
+    	The positional arguments. This accepts either a single string 'location' value, which must be recognised as a region in OSM. Otherwise 4 float arguements are accepted as 'north, south, east, west', defining a box for the chosen region. A HazardRegion can also be passed instead, so the OSM data is reused between functions
     	
     buffer: float, optional
     	Description of the buffer. If provided, it represents the degree distance buffer at which to remove additional river data. Default to None.
@@ -0,0 +1,140 @@
+from ..third_party import np, shapely, STRtree
+from ..dem.sampler import RasterSampler
+from .river_list import river_list
+from .nearest_river import nearest_vertex
+from ..region import region_cache
+
+
+class RiverNetwork:
+    """
+    The rivers of a region stored as flat arrays, so the flood functions can work on every vertex at once instead of walking the rivers row by row. All vertices are held in one (n, 2) float64 array of lon, lat, with CSR style offsets giving the vertices of each line part and the parts of each river.
+
+    Parameters
+    ----------
+    rivers: geopandas.geodataframe.GeoDataFrame
+        The rivers, e.g. from river_list
+    column: str, Optional
+        The column of rivers holding the river geometries. Default = 'geometry', use 'new geometry' for the rivers cut to a buffer
+
+    Attributes
+    ----------
+    coords: numpy.ndarray
+        The lon, lat of every vertex, river by river and part by part
+    part_offsets: numpy.ndarray
+        The vertices of part k are coords[part_offsets[k]:part_offsets[k + 1]]
+    river_offsets: numpy.ndarray
+        The parts of river i are part_offsets[river_offsets[i]:river_offsets[i + 1]]
+    ids, names: numpy.ndarray
+        The OSM id and name of each river
+    elevation: numpy.ndarray
+        The elevation of each vertex, once attach_elevation has been called
+    vertex_tree, line_tree: shapely.STRtree
+        Spatial indexes over the vertices and the line parts, built the first time they are needed. The network of a HazardRegion is stored on the region by river_network, so each index is built once per region
+    """
+    def __init__(self, rivers, column = 'geometry'):
+        #Only the lines are kept, e.g. a river cut by a buffer can also give single points
+        parts, part_river = shapely.get_parts(np.asarray(rivers[column]), return_index = True)
+        lines = np.isin(shapely.get_type_id(parts), [1, 2])
+        parts, part_river = parts[lines], part_river[lines]
+        self.parts, self.part_river = parts, part_river
+        self.coords, vertex_part = shapely.get_coordinates(parts, return_index = True)
+
+        self.part_offsets = np.concatenate([[0], np.cumsum(np.bincount(vertex_part, minlength = len(parts)))])
+        self.river_offsets = np.concatenate([[0], np.cumsum(np.bincount(part_river, minlength = len(rivers)))])
+        self.ids = np.asarray(rivers.index.get_level_values('osmid') if 'osmid' in rivers.index.names else rivers.index)
+        self.names = rivers['name'].to_numpy()
+        self.elevation = None
+        self._vertex_tree = None
+        self._line_tree = None
+
+    def __len__(self):
+        return len(self.river_offsets) - 1
+
+    @property
+    def vertex_offsets(self):
+        #The vertices of river i are coords[vertex_offsets[i]:vertex_offsets[i + 1]]
+        return self.part_offsets[self.river_offsets]
+
+    @property
+    def vertex_river(self):
+        #The river (row number) of every vertex
+        return np.repeat(np.arange(len(self)), np.diff(self.vertex_offsets))
+
+    @property
+    def vertex_tree(self):
+        if self._vertex_tree is None:
+            self._vertex_tree = STRtree(shapely.points(self.coords))
+        return self._vertex_tree
+
+    @property
+    def line_tree(self):
+        if self._line_tree is None:
+            self._line_tree = STRtree(self.parts)
+        return self._line_tree
+
+    def river_coords(self, i):
+        return self.coords[self.vertex_offsets[i]:self.vertex_offsets[i + 1]]
+
+    def split(self, values):
+        #Split a per-vertex array into a list with one array per river
+        return np.split(values, self.vertex_offsets[1:-1])
+
+    def attach_elevation(self, geotiff_path, resolution = None):
+        """
+        Sample the elevation of every vertex from a geotiff, reading each block of the file that holds a vertex once. Vertices outside the geotiff or on nodata pixels are NaN. A resolution in metres samples the coarsest overview of the geotiff that meets it.
+        """
+        self.elevation = RasterSampler(geotiff_path, resolution = resolution).sample(self.coords)
+        return self
+
+    def nearest(self, points, max_distance = None):
+        """
+        Return the distance in degrees from each point to the nearest river vertex, the position of that vertex in coords and the row number of its river (-1 where no vertex is within max_distance).
+        """
+        distance, vertex = nearest_vertex(points, self.coords, max_distance = max_distance, tree = self.vertex_tree if len(self.coords) else None)
+        river_index = np.where(vertex >= 0, self.vertex_river[vertex] if len(self.coords) else -1, -1)
+        return distance, vertex, river_index
+
+    def nearest_line(self, points, max_distance = None):
+        """
+        Return the distance in degrees from each point to the nearest point on any river line (not only its vertices), and the row number of that river (-1 where no river is within max_distance).
+        """
+        distance = np.full(len(points), np.nan)
+        river_index = np.full(len(points), -1)
+        if len(self.parts) == 0 or len(points) == 0:
+            return distance, river_index
+        (point_index, part_index), found = self.line_tree.query_nearest(np.asarray(points), max_distance = max_distance, return_distance = True, all_matches = False)
+        distance[point_index] = found
+        river_index[point_index] = self.part_river[part_index]
+        return distance, river_index
+
+
+@region_cache('buffer', 'geotiff_path', 'resolution')
+def river_network(*args, buffer = None, geotiff_path = None, resolution = None):
+    """
+    Return the rivers of a region from river_list as a RiverNetwork, with the elevation of every vertex if a geotiff is given. When a HazardRegion is passed the network is built once and shared by the flood functions.
+
+    Parameters
+    ----------
+    *args: Union[str, Tuple[float, float, float, float]]
+    	The positional arguments. This accepts either a single string 'location' value, which must be recognised as a region in OSM. Otherwise 4 float arguements are accepted as 'north, south, east, west', defining a box for the chosen region. A HazardRegion can also be passed instead, so the OSM data is reused between functions
+    buffer: float, optional
+    	The degree distance buffer at which to remove additional river data, as in river_list. Default to None
+    geotiff_path: str, optional
+    	The str name of a downloaded geotiff of elevation data that covers the chosen region. Default to None, meaning no elevations are attached
+    resolution: float, optional
+    	The DEM pixel size in metres that is good enough, read from the coarsest overview of the geotiff that meets it (see build_overviews). Default to None, meaning the full resolution
+
+    Returns
+    -------
+    network: RiverNetwork
+    	The vertices, parts, ids and names of the rivers (cut to the buffer if one is given)
+    """
+    if buffer is None:
+        river, polygon = river_list(*args, print_list = False)
+        network = RiverNetwork(river)
+    else:
+        river, polygon, buffered_polygon = river_list(*args, buffer = buffer, print_list = False)
+        network = RiverNetwork(river, column = 'new geometry')
+    if geotiff_path is not None:
+        network.attach_elevation(geotiff_path, resolution = resolution)
+    return network
@@ -1,4 +1,5 @@
 from ..third_party import ox,np, plt, gpd, Polygon
+from ..osm.roads import road_network
 
 def landslide_map(file, place = None, tags = True, crs = 'EPSG:4326'):
     """
@@ -46,13 +47,9 @@ def landslide_map(file, place = None, tags = True, crs = 'EPSG:4326'):
     boundary_box = Polygon([(x_min, y_min), (x_min, y_max), (x_max, y_max), (x_max, y_min)])
     
     if place == None:
-        roads = ox.features_from_polygon(boundary_box, tags = {'highway': tags})
+        roads = road_network(boundary_box, tags)
     else:
-        roads = ox.features_from_place(place, tags = {'highway': tags})
-    
-    #Remove node roads so they dont muddy up the graph
-    roads_reset = roads.reset_index()
-    roads = roads_reset[roads_reset['element_type'] != 'node']#= roads[roads['element_type'] != 'node']
+        roads = road_network(place, tags)
     
     #Plot
     ax = landslides['lon/lat geometry'].plot(figsize=(10, 10), alpha=0.5, color = 'darkgray')
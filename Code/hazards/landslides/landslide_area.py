@@ -1,4 +1,5 @@
 from ..third_party import plt, gpd, ox, Polygon 
+from ..osm.roads import road_network
 from .find_area_column import find_area_column 
 
 def landslide_area(file, place = None, tags = True, crs = 'EPSG:4326', area = None):
@@ -51,12 +52,9 @@ def landslide_area(file, place = None, tags = True, crs = 'EPSG:4326', area = No
             x_min, y_min, x_max, y_max = landslides['lon/lat geometry'].total_bounds
         
             boundary_box = Polygon([(x_min, y_min), (x_min, y_max), (x_max, y_max), (x_max, y_min)])
-            roads = ox.features_from_polygon(boundary_box, tags = {'highway': tags})
+            roads = road_network(boundary_box, tags)
         else:
-            roads = ox.features_from_place(place, tags = {'highway': tags})
-        
-        roads_reset = roads.reset_index()
-        roads = roads_reset[roads_reset['element_type'] != 'node']#= roads[roads['element_type'] != 'node']
+            roads = road_network(place, tags)
     
         #Find the area column of the data:
         area_column = find_area_column(landslides)
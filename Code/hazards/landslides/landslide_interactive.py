@@ -1,4 +1,5 @@
 from ..third_party import gpd , ox, folium, MarkerCluster, Polygon 
+from ..osm.roads import road_network
 from .find_area_column import find_area_column
 
 def landslide_interactive(file, place = None, tags = True, crs = 'EPSG:4326', intersept = True, area = None, n = None, total = True):
@@ -57,13 +58,10 @@ def landslide_interactive(file, place = None, tags = True, crs = 'EPSG:4326', in
             x_min, y_min, x_max, y_max = landslides['lon/lat geometry'].total_bounds
         
             boundary_box = Polygon([(x_min, y_min), (x_min, y_max), (x_max, y_max), (x_max, y_min)])
-            roads = ox.features_from_polygon(boundary_box, tags = {'highway': tags})
+            roads = road_network(boundary_box, tags)
         else:
-            roads = ox.features_from_place(place, tags = {'highway': tags})
-    roads_reset = roads.reset_index()
-    roads = roads_reset[roads_reset['element_type'] != 'node']#= roads[roads['element_type'] != 'node']
+            roads = road_network(place, tags)
 
-    
     #area column 
     if area is None:
         area_column = find_area_column(landslides)
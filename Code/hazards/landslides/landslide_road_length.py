@@ -1,4 +1,5 @@
 from ..third_party import plt, gpd, pd, ox, Polygon
+from ..osm.roads import road_network
 
 def landslide_road_length(file, place = None, tags = True, crs = 'EPSG:4326'):
     """
@@ -50,13 +51,9 @@ def landslide_road_length(file, place = None, tags = True, crs = 'EPSG:4326'):
             x_min, y_min, x_max, y_max = landslides['lon/lat geometry'].total_bounds
         
             boundary_box = Polygon([(x_min, y_min), (x_min, y_max), (x_max, y_max), (x_max, y_min)])
-            roads = ox.features_from_polygon(boundary_box, tags = {'highway': tags})
+            roads = road_network(boundary_box, tags)
         else:
-            roads = ox.features_from_place(place, tags = {'highway': tags})
-        
-        #ensure that there is no node values in the road dataset
-        roads_reset = roads.reset_index()
-        roads = roads_reset[roads_reset['element_type'] != 'node']#= roads[roads['element_type'] != 'node']
+            roads = road_network(place, tags)
         
         #Interseption code:
         landslides['intersept'] = 0 #will be a count of the number of roads an landslide has intersepted
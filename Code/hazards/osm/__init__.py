@@ -0,0 +1,9 @@
+#OpenStreetMaps (OSM) data access shared by the hazard sub-packages
+from .cache import cache_settings, clear_cache
+from .source import osm_source
+from .boundary import region_boundary
+from .features import features_from_place, features_from_bbox, features_from_polygon
+from .tiles import tile_settings, features_from_bbox_tiled
+from .bulk import features_layers
+from .roads import road_network
+from .refresh import refresh_region
@@ -0,0 +1,88 @@
+import os
+import json
+import hashlib
+import tempfile
+
+from ..third_party import ox, wkb
+from .cache import settings
+from .source import source, query_kind
+from .pbf import place_boundary_from_file
+
+#Simplified versions of each boundary kept in the gazetteer, in degrees
+TOLERANCES = (0.0001, 0.001, 0.01)
+
+#Boundaries already used in this session
+gazetteer = {}
+
+
+def _path(key):
+    return os.path.join(settings['folder'], 'gazetteer', f'{key}.json')
+
+
+def _read(key):
+    try:
+        with open(_path(key)) as file:
+            entry = json.load(file)
+    except (OSError, ValueError):
+        return None
+    return {float(tolerance): wkb.loads(value, hex = True) for tolerance, value in entry['polygons'].items()}
+
+
+def _write(key, name, polygons):
+    path = _path(key)
+    os.makedirs(os.path.dirname(path), exist_ok = True)
+    handle, temp = tempfile.mkstemp(dir = os.path.dirname(path), suffix = '.tmp')
+    with os.fdopen(handle, 'w') as file:
+        json.dump({'name': name, 'polygons': {str(tolerance): polygon.wkb_hex for tolerance, polygon in polygons.items()}}, file)
+    os.replace(temp, path)
+
+
+def _geocode(name):
+    if source['file'] is not None:
+        polygon = place_boundary_from_file(source['file'], name)
+        if polygon is None:
+            raise ValueError(f'No boundary named {name!r} was found in the local extract {source["file"]}')
+        return polygon
+    print(f'Finding the boundary of: {name}')
+    try:
+        return ox.geocode_to_gdf(name).unary_union
+    except (ox._errors.InsufficientResponseError, ValueError, TypeError) as error:
+        raise ValueError(f'{name!r} could not be geocoded to a region boundary in OSM: {error}') from error
+
+
+def region_boundary(name, tolerance = None):
+    """
+    Return the boundary polygon of a named region. The place name is geocoded to its administrative boundary the first time it is used, and the polygon (with simplified versions at several tolerances) is stored in a local gazetteer, so later calls take milliseconds. A ValueError is raised if the name cannot be geocoded (or is not in the local extract chosen with osm_source()).
+
+    Parameters
+    ----------
+    name: str
+        The name of the region, which must be recognised as a region in OpenStreetMaps (OSM)
+    tolerance: float, Optional
+        The tolerance in degrees of a simplified boundary, e.g. 0.001. Default = None, meaning the full boundary is returned
+
+    Returns
+    -------
+    polygon: shapely.geometry.polygon.Polygon
+        The boundary of the region, in lat, lon
+
+    Example: hazards.region_boundary('Peebles', tolerance = 0.001)
+    """
+    key = hashlib.sha256(json.dumps([query_kind('boundary'), name]).encode()).hexdigest()
+    polygons = gazetteer.get(key)
+    if polygons is None:
+        polygons = _read(key)
+    if polygons is None:
+        polygon = _geocode(name)
+        polygons = {0.0: polygon}
+        for t in TOLERANCES:
+            polygons[t] = polygon.simplify(t, preserve_topology = True)
+        _write(key, name, polygons)
+    gazetteer[key] = polygons
+
+    if tolerance is None:
+        return polygons[0.0]
+    if tolerance not in polygons:
+        polygons[tolerance] = polygons[0.0].simplify(tolerance, preserve_topology = True)
+        _write(key, name, polygons)
+    return polygons[tolerance]
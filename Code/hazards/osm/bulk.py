@@ -0,0 +1,115 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from ..third_party import pd, ox
+from .cache import store
+from .features import fetch_polygon
+from .source import query_kind
+from .boundary import region_boundary
+from .roads import reduce_roads
+from .tiles import settings as tile_settings, tile_queries, fetch_tile, merge_tiles
+
+#The tags used by the package for each layer. These must match the tags of the individual queries (building_setup, river, the road loaders) so that the split layers can be stored in the cache in their place.
+LAYERS = {
+    'buildings': {'building': True},
+    'rivers': {'waterway': 'river'},
+    'roads': {'highway': True},
+}
+
+
+def tag_mask(features, tags):
+    """
+    Return a boolean Series of the features that match a tag dictionary, using the same rules as osmnx: True matches any value, otherwise a single value or a list of values.
+    """
+    mask = pd.Series(False, index = features.index)
+    for key, value in tags.items():
+        if key not in features.columns:
+            continue
+        if value is True:
+            mask = mask | features[key].notna()
+        elif isinstance(value, list):
+            mask = mask | features[key].isin(value)
+        else:
+            mask = mask | (features[key] == value)
+    return mask
+
+
+def _combine(tag_sets):
+    #Merge the tag dictionaries of every layer into the tags of one query
+    combined = {}
+    for tags in tag_sets.values():
+        for key, value in tags.items():
+            if key not in combined:
+                combined[key] = value
+            elif combined[key] is True or value is True:
+                combined[key] = True
+            else:
+                old = combined[key] if isinstance(combined[key], list) else [combined[key]]
+                new = value if isinstance(value, list) else [value]
+                combined[key] = old + [v for v in new if v not in old]
+    return combined
+
+
+def _split(features, tag_sets):
+    return {layer: features[tag_mask(features, tags)] for layer, tags in tag_sets.items()}
+
+
+def features_layers(*args, layers = ('buildings', 'rivers')):
+    """
+    Return several OpenStreetMaps (OSM) layers of a region (e.g. buildings and rivers) from a single combined query, split into a GeoDataFrame per layer. Each layer is also stored in the cache as if it had been downloaded on its own, so building_setup, river and the road loaders then read it without another download.
+
+    Parameters
+    ----------
+    *args: Union[str, Tuple[float, float, float, float]]
+        The positional arguments. This accepts either a single string 'location' value, which must be recognised as a region in OSM. Otherwise 4 float arguments are accepted as 'north, south, east, west', defining a box for the chosen region
+    layers: list, Optional
+        The layers wanted, from 'buildings', 'rivers' and 'roads'. Default = ('buildings', 'rivers')
+
+    Returns
+    -------
+    layers: dict
+        The GeoDataFrame of each layer, keyed by the layer name
+
+    Example: hazards.features_layers('Peebles', layers = ['buildings', 'rivers', 'roads'])
+    """
+    tag_sets = {layer: LAYERS[layer] for layer in layers}
+
+    if len(args) == 1 and isinstance(args[0], str):
+        name = args[0]
+        print(f'Processing {", ".join(tag_sets)} in: {name}')
+        #Stored under the boundary polygon, which is what features_from_place queries
+        polygon = region_boundary(name)
+        #Only the split layers are cached, not the combined query as well
+        split = _split(fetch_polygon(polygon, _combine(tag_sets)), tag_sets)
+        for layer, tags in tag_sets.items():
+            store(query_kind('polygon'), polygon, tags, split[layer])
+        if 'roads' in split:
+            #road_network keeps its own reduced copy of the full network
+            store(query_kind('roads'), polygon, {'highway': True}, reduce_roads(split['roads']))
+        return split
+
+    elif len(args) == 4:
+        north, south, east, west = args
+        #The same tiles as features_from_bbox_tiled, so the stored layers are found by building_setup and river
+        queries = tile_queries(north, south, east, west)
+        print(f'Processing {", ".join(tag_sets)} in lat long grid')
+        combined = _combine(tag_sets)
+        with ThreadPoolExecutor(max_workers = tile_settings['max_workers']) as pool:
+            results = list(pool.map(lambda query: fetch_tile(query, combined, cache = False), queries))
+
+        split = {layer: [] for layer in tag_sets}
+        for query, result in zip(queries, results):
+            for layer, features in _split(result, tag_sets).items():
+                store(query_kind('bbox'), query, tag_sets[layer], features)
+                split[layer].append(features)
+        for layer in split:
+            try:
+                split[layer] = merge_tiles(split[layer], north, south, east, west)
+            except ox._errors.InsufficientResponseError:
+                split[layer] = None
+                print(f'No {layer} found in grid')
+        return split
+
+    else:
+        print('Invalid arguments passed. Either -')
+        print('        1 value: The name of a given area')
+        print('        4 values: lat1, lat2, lon1, lon2')
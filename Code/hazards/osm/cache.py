@@ -0,0 +1,261 @@
+import os
+import json
+import time
+import hashlib
+import tempfile
+import warnings
+
+from ..third_party import np, gpd
+
+#Package wide cache settings. Change these through cache_settings() rather than editing the dictionary.
+settings = {
+    'enabled': True,
+    'folder': os.environ.get('HAZARDS_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'hazards')),
+    'max_size': 2 * 1024**3,   #bytes, 2 GB
+    'ttl': 30 * 24 * 60 * 60,  #seconds, 30 days
+}
+
+#The cache folder is checked against max_size every EVICT_EVERY writes, or sooner once the writes since the last check add up to EVICT_FRACTION of max_size, rather than on every write
+EVICT_EVERY = 64
+EVICT_FRACTION = 0.05
+pending = {'writes': 0, 'bytes': 0}
+
+
+def cache_settings(enabled = None, folder = None, max_size = None, ttl = None):
+    """
+    Change or view the settings of the on-disk OpenStreetMaps (OSM) cache. Every OSM features query made by the package is stored in this cache so that re-running an analysis on the same region does not download the data again.
+
+    Parameters
+    ----------
+    enabled: bool, Optional
+        Toggle for the cache. Default = None, meaning the current setting is kept (the cache is on by default)
+    folder: str, Optional
+        The folder the cache is stored in. Default = None, meaning the current setting is kept (~/.cache/hazards, or the HAZARDS_CACHE environment variable if set)
+    max_size: int, Optional
+        The maximum size of the cache in bytes. The least recently used entries are removed once this is exceeded, checked every few writes. Default = None, meaning the current setting is kept (2 GB)
+    ttl: float, Optional
+        The time in seconds after which a cached query is considered out of date and is downloaded again. Default = None, meaning the current setting is kept (30 days)
+
+    Returns
+    -------
+    settings: dict
+        A copy of the cache settings after the changes have been made
+
+    Example: hazards.cache_settings(max_size = 500 * 1024**2, ttl = 7 * 24 * 60 * 60)
+    """
+    if enabled is not None:
+        settings['enabled'] = enabled
+    if folder is not None:
+        settings['folder'] = folder
+    if max_size is not None:
+        settings['max_size'] = max_size
+    if ttl is not None:
+        settings['ttl'] = ttl
+    return dict(settings)
+
+
+def cache_key(kind, query, tags):
+    #Hash of the query type, the region (place name, bbox or shapely geometry) and the tag dictionary
+    if hasattr(query, 'wkb_hex'):
+        query = query.wkb_hex
+    text = json.dumps([kind, query, tags], sort_keys = True, default = str)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _path(key):
+    return os.path.join(settings['folder'], 'osm', key[:2], f'{key}.parquet')
+
+
+def _storable(gdf):
+    #OSM returns some columns (e.g. 'nodes', 'ways') as python lists. Columns holding only lists (and missing values) are stored as parquet lists and turned back into python lists by _restore, any other mix is stored as strings.
+    gdf = gdf.copy()
+    for column in gdf.columns:
+        if column == gdf.geometry.name or gdf[column].dtype != object:
+            continue
+        values = gdf[column].dropna()
+        containers = values.map(lambda value: isinstance(value, (list, tuple, set, dict)))
+        if not containers.any():
+            continue
+        if containers.all() and values.map(lambda value: isinstance(value, (list, tuple))).all():
+            gdf[column] = gdf[column].map(lambda value: list(value) if isinstance(value, (list, tuple)) else None)
+        else:
+            gdf[column] = gdf[column].map(lambda value: str(value) if isinstance(value, (list, tuple, set, dict)) else value)
+    return gdf
+
+
+def _restore(gdf):
+    #Parquet lists are read back as numpy arrays and the missing values as None. Return them as python lists and NaN, as OSM does.
+    for column in gdf.columns:
+        if column == gdf.geometry.name or gdf[column].dtype != object:
+            continue
+        if gdf[column].map(lambda value: isinstance(value, np.ndarray)).any():
+            gdf[column] = gdf[column].map(lambda value: value.tolist() if isinstance(value, np.ndarray) else np.nan)
+    return gdf
+
+
+def read(key):
+    """
+    Return the cached GeoDataFrame for a key, or None if it is missing or older than the ttl setting.
+    """
+    path = _path(key)
+    try:
+        created = os.path.getmtime(path)
+    except OSError:
+        return None
+    if time.time() - created > settings['ttl']:
+        _remove(path)
+        return None
+    try:
+        gdf = gpd.read_parquet(path)
+    except Exception:
+        #Partially removed by another process or unreadable. Treat as missing.
+        return None
+    gdf = _restore(gdf)
+    #The access time records the last use (for LRU eviction), the modified time records when it was downloaded (for ttl)
+    try:
+        os.utime(path, (time.time(), created))
+    except OSError:
+        pass
+    return gdf
+
+
+def write(key, gdf):
+    """
+    Store a GeoDataFrame in the cache under key. The file is written to a temporary name and then moved into place, so other processes sharing the cache never read a half written file.
+    """
+    path = _path(key)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok = True)
+        handle, temp = tempfile.mkstemp(dir = os.path.dirname(path), suffix = '.tmp')
+        os.close(handle)
+    except OSError as error:
+        warnings.warn(f'The OSM data could not be stored in the cache at {path}: {error!r}')
+        return
+    try:
+        _storable(gdf).to_parquet(temp)
+        size = os.path.getsize(temp)
+        os.replace(temp, path)
+    except ImportError:
+        _remove(temp)
+        print('CAUTION: pyarrow is needed to store OSM data in the cache. The cache has been turned off')
+        settings['enabled'] = False
+        return
+    except Exception as error:
+        _remove(temp)
+        warnings.warn(f'The OSM data could not be stored in the cache at {path}: {error!r}')
+        return
+    pending['writes'] = pending['writes'] + 1
+    pending['bytes'] = pending['bytes'] + size
+    if pending['writes'] >= EVICT_EVERY or pending['bytes'] >= EVICT_FRACTION * settings['max_size']:
+        evict()
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _entries():
+    entries = []
+    for root, dirs, files in os.walk(os.path.join(settings['folder'], 'osm')):
+        for name in files:
+            if name.endswith('.parquet'):
+                path = os.path.join(root, name)
+                try:
+                    info = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((info.st_atime, info.st_mtime, info.st_size, path))
+    return entries
+
+
+def evict():
+    """
+    Remove out of date cache entries, then the least recently used entries until the cache is below the max_size setting.
+    """
+    pending['writes'], pending['bytes'] = 0, 0
+    now = time.time()
+    entries = []
+    for atime, mtime, size, path in _entries():
+        if now - mtime > settings['ttl']:
+            _remove(path)
+        else:
+            entries.append((atime, size, path))
+
+    total = sum(size for atime, size, path in entries)
+    for atime, size, path in sorted(entries):
+        if total <= settings['max_size']:
+            break
+        _remove(path)
+        total = total - size
+
+
+def clear_cache():
+    """
+    Remove every OpenStreetMaps (OSM) query stored in the cache.
+    """
+    for atime, mtime, size, path in _entries():
+        _remove(path)
+
+
+def cached(kind, query, tags, fetch):
+    """
+    Return the cached result of an OSM query, calling fetch() and storing the result if it is not already in the cache.
+
+    Parameters
+    ----------
+    kind: str
+        The type of query, e.g. 'place', 'bbox' or 'polygon'
+    query: Union[str, tuple, shapely.geometry]
+        The region of the query. Together with kind and tags this forms the cache key
+    tags: dict
+        The OSM tags of the query
+    fetch: callable
+        Function that downloads the data when it is not in the cache
+    """
+    if not settings['enabled']:
+        return fetch()
+    key = cache_key(kind, query, tags)
+    gdf = read(key)
+    if gdf is None:
+        gdf = fetch()
+        write(key, gdf)
+    return gdf
+
+
+def store(kind, query, tags, gdf):
+    """
+    Add the result of an OSM query to the cache without downloading it, e.g. a layer split from a larger combined query.
+    """
+    if settings['enabled']:
+        write(cache_key(kind, query, tags), gdf)
+
+
+def downloaded(kind, query, tags):
+    """
+    Return the time (in seconds since the epoch) the cached result of an OSM query was downloaded, or None if it is not in the cache.
+    """
+    try:
+        return os.path.getmtime(_path(cache_key(kind, query, tags)))
+    except OSError:
+        return None
+
+
+def renew(kind, query, tags):
+    """
+    Mark the cached result of an OSM query as downloaded now, after a check has found it is still up to date, so it is kept for another ttl.
+    """
+    path = _path(cache_key(kind, query, tags))
+    try:
+        os.utime(path, (time.time(), time.time()))
+    except OSError:
+        pass
+
+
+def discard(kind, query, tags):
+    """
+    Remove the cached result of an OSM query.
+    """
+    _remove(_path(cache_key(kind, query, tags)))
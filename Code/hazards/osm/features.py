@@ -0,0 +1,80 @@
+from ..third_party import ox, box
+from .cache import cached
+from .pbf import features_from_file
+from .source import source, query_kind
+from .boundary import region_boundary
+
+#Wrappers around the osmnx features queries. All OSM downloads in the package go through these so that they are stored in the cache.
+#If a local extract has been chosen with osm_source() the features are read from that file instead of the Overpass API.
+
+
+def features_from_place(name, tags):
+    """
+    Return the OpenStreetMaps (OSM) features with the given tags within the boundary of a named region, using the cache where possible.
+
+    Parameters
+    ----------
+    name: str
+        The name of the region, which must be recognised as a region in OSM
+    tags: dict
+        The OSM tags of the features, e.g. {'building': True}
+
+    Returns
+    -------
+    features: geopandas.geodataframe.GeoDataFrame
+        The features returned by osmnx.features_from_place, or read from the local extract chosen with osm_source()
+    """
+    #osmnx also geocodes the place to its boundary and then queries that polygon. The boundary is resolved once and kept in the gazetteer cache.
+    return features_from_polygon(region_boundary(name), tags)
+
+
+def features_from_bbox(north, south, east, west, tags):
+    """
+    Return the OpenStreetMaps (OSM) features with the given tags within a lat, lon box, using the cache where possible.
+
+    Parameters
+    ----------
+    north, south, east, west: float
+        The edges of the box
+    tags: dict
+        The OSM tags of the features, e.g. {'building': True}
+
+    Returns
+    -------
+    features: geopandas.geodataframe.GeoDataFrame
+        The features returned by osmnx.features_from_bbox, or read from the local extract chosen with osm_source()
+    """
+    return cached(query_kind('bbox'), (north, south, east, west), tags, lambda: fetch_bbox(north, south, east, west, tags))
+
+
+def features_from_polygon(polygon, tags):
+    """
+    Return the OpenStreetMaps (OSM) features with the given tags within a polygon, using the cache where possible.
+
+    Parameters
+    ----------
+    polygon: shapely.geometry.polygon.Polygon
+        The region of interest, in lat, lon
+    tags: dict
+        The OSM tags of the features, e.g. {'building': True}
+
+    Returns
+    -------
+    features: geopandas.geodataframe.GeoDataFrame
+        The features returned by osmnx.features_from_polygon, or read from the local extract chosen with osm_source()
+    """
+    return cached(query_kind('polygon'), polygon, tags, lambda: fetch_polygon(polygon, tags))
+
+
+def fetch_bbox(north, south, east, west, tags):
+    #Download (or read from the local extract) without using the cache, as fetch_polygon
+    if source['file'] is not None:
+        return features_from_file(source['file'], box(west, south, east, north), tags)
+    return ox.features_from_bbox(north, south, east, west, tags = tags)
+
+
+def fetch_polygon(polygon, tags):
+    #Download (or read from the local extract) without using the cache, for loaders that store a reduced version of the result themselves
+    if source['file'] is not None:
+        return features_from_file(source['file'], polygon, tags)
+    return ox.features_from_polygon(polygon, tags = tags)
@@ -0,0 +1,149 @@
+import asyncio
+
+from ..third_party import aiohttp, gpd, pd, box
+from ..region import HazardRegion
+from .boundary import region_boundary
+from .bulk import tag_mask, LAYERS
+from .cache import settings, cache_key, read, store
+from .source import source
+from .tiles import tile_queries
+from .overpass import OVERPASS_URL, overpass_query, elements_to_gdf
+
+#Columns returned by building_setup and river
+BUILDING_COLUMNS = ['amenity', 'geometry', 'building', 'type']
+RIVER_COLUMNS = ['geometry', 'name']
+
+
+class RateLimit:
+    """
+    Limits the Overpass requests to a number running at the same time (concurrency) and a number started per second (rate).
+    """
+    def __init__(self, concurrency, rate):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.interval = 1 / rate if rate else 0
+        self.next_start = 0
+        self.lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        await self.semaphore.acquire()
+        async with self.lock:
+            now = asyncio.get_running_loop().time()
+            wait = self.next_start - now
+            self.next_start = max(now, self.next_start) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def __aexit__(self, *exc):
+        self.semaphore.release()
+
+
+async def _post(session, limit, url, query, retries):
+    #Overpass answers 429 (too many requests) and 504 (busy) when overloaded, so these are retried with an increasing wait
+    for attempt in range(retries + 1):
+        async with limit:
+            async with session.post(url, data = {'data': query}) as response:
+                if response.status not in (429, 504) or attempt == retries:
+                    response.raise_for_status()
+                    return await response.json(content_type = None)
+        await asyncio.sleep(2**attempt)
+
+
+def _entries(args, polygon):
+    #The (kind, query) of the cache entries the layers of a region are stored under, as in features_layers
+    if len(args) == 1:
+        return [('polygon', polygon)]
+    return [('bbox', tile) for tile in tile_queries(*args)]
+
+
+def _cached_layers(args, polygon):
+    #The buildings and rivers of a region read from the cache, or None if any of its entries is missing
+    if not settings['enabled'] or source['file'] is not None:
+        return None
+    layers = {}
+    for layer in ('buildings', 'rivers'):
+        parts = [read(cache_key(kind, query, LAYERS[layer])) for kind, query in _entries(args, polygon)]
+        if any(part is None for part in parts):
+            return None
+        parts = [part for part in parts if len(part) != 0]
+        if len(parts) == 0:
+            layers[layer] = gpd.GeoDataFrame(geometry = [], crs = 'EPSG:4326')
+            continue
+        features = pd.concat(parts)
+        features = features[~features.index.duplicated(keep = 'first')]
+        layers[layer] = features[features.intersects(polygon)]
+    return layers
+
+
+def _store_layers(args, polygon, layers):
+    #Store each layer under the same cache entries as the synchronous loaders (see features_layers), so later runs read them from the cache and refresh_region can check them
+    if source['file'] is not None:
+        return #these entries would be read in place of the local extract
+    for kind, query in _entries(args, polygon):
+        if kind == 'bbox':
+            north, south, east, west = query
+            inside = box(west, south, east, north)
+        for layer, features in layers.items():
+            store(kind, query, LAYERS[layer], features[features.intersects(inside)] if kind == 'bbox' else features)
+
+
+async def _fetch_region(session, limit, region, url, retries):
+    args = tuple(region) if isinstance(region, (tuple, list)) else (region,)
+    if len(args) == 1 and isinstance(args[0], str):
+        #The gazetteer lookup is synchronous (and usually already cached), so it runs in a thread
+        polygon = await asyncio.to_thread(region_boundary, args[0])
+    else:
+        north, south, east, west = args
+        polygon = box(west, south, east, north)
+
+    #Regions downloaded before (by fetch_regions or the synchronous loaders) are read from the cache instead
+    layers = await asyncio.to_thread(_cached_layers, args, polygon)
+    if layers is None:
+        tags = {**LAYERS['buildings'], **LAYERS['rivers']}
+        data = await _post(session, limit, url, overpass_query(tags, polygon.bounds), retries)
+        features = elements_to_gdf(data.get('elements', []))
+        features = features[features.intersects(polygon)]
+
+        layers = {layer: features[tag_mask(features, LAYERS[layer])] for layer in ('buildings', 'rivers')}
+        await asyncio.to_thread(_store_layers, args, polygon, layers)
+
+    buildings = layers['buildings'].reindex(columns = BUILDING_COLUMNS)
+    rivers = layers['rivers'].reindex(columns = RIVER_COLUMNS)
+    print(f'{args[0] if len(args) == 1 else "LatLongGrid"}: {len(buildings)} buildings, {rivers["name"].nunique()} unique rivers')
+
+    result = HazardRegion(*args)
+    result.set_layers(buildings, rivers, polygon)
+    return result
+
+
+async def fetch_regions(regions, overpass_url = None, concurrency = 2, rate = 1.0, retries = 3):
+    """
+    Download the buildings and rivers of many regions at the same time, over one pooled HTTP session to the Overpass API. This is an asynchronous function, so it is called with await (or asyncio.run).
+
+    Parameters
+    ----------
+    regions: list
+        The regions, each either a place name recognised in OpenStreetMaps (OSM) or a tuple of 4 floats 'north, south, east, west'
+    overpass_url: str, Optional
+        The Overpass API interpreter url, e.g. a local Overpass server. Default = None, meaning the public server is used
+    concurrency: int, Optional
+        The number of Overpass requests allowed to run at the same time. Default = 2
+    rate: float, Optional
+        The number of Overpass requests allowed to start per second. Default = 1
+    retries: int, Optional
+        The number of times a request is retried when Overpass is busy. Default = 3
+
+    Returns
+    -------
+    regions: list
+        A HazardRegion for each region, in the order given, already holding its buildings and rivers. Each layer is also stored in the OSM cache under the same entries as features_layers, so later runs read it from the cache and it can be checked with refresh_region. region.buildings and region.rivers are the same GeoDataFrames as building_setup and river return, and the regions can be passed straight to the flood functions
+
+    Example: regions = await hazards.fetch_regions(['Peebles', 'Galashiels', 'Hawick'])
+             hazards.building_dis(regions[0])
+    """
+    if aiohttp is None:
+        raise ImportError('aiohttp is needed for fetch_regions: pip install aiohttp')
+    url = overpass_url if overpass_url is not None else OVERPASS_URL
+    limit = RateLimit(concurrency, rate)
+    connector = aiohttp.TCPConnector(limit = concurrency)
+    async with aiohttp.ClientSession(connector = connector) as session:
+        return await asyncio.gather(*[_fetch_region(session, limit, region, url, retries) for region in regions])
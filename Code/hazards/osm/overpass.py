@@ -0,0 +1,94 @@
+from ..third_party import gpd, pd, Point, LineString, Polygon, MultiPolygon, polygonize
+from .pbf import is_area
+
+#Builds Overpass API queries directly and turns the json response into the same layout as the osmnx features functions. Used where osmnx cannot be (asynchronous downloads and change checks).
+OVERPASS_URL = 'https://overpass-api.de/api/interpreter'
+
+
+def overpass_filters(tags):
+    """
+    Return the Overpass tag filters, e.g. '["waterway"="river"]', for an osmnx style tag dictionary. Each filter is a separate query statement, so the features matching any of them are returned.
+    """
+    filters = []
+    for key, value in tags.items():
+        if value is True:
+            filters.append(f'["{key}"]')
+        elif isinstance(value, list):
+            filters.append(f'["{key}"~"^({"|".join(value)})$"]')
+        else:
+            filters.append(f'["{key}"="{value}"]')
+    return filters
+
+
+def overpass_query(tags, bounds, out = 'body geom', timeout = 180, newer = None):
+    """
+    Return an Overpass QL query for the elements matching tags within bounds.
+
+    Parameters
+    ----------
+    tags: dict
+        The OSM tags of the features, e.g. {'building': True, 'waterway': 'river'}
+    bounds: Tuple[float, float, float, float]
+        The (min lon, min lat, max lon, max lat) of the region, as given by shapely .bounds
+    out: str, Optional
+        What is returned for each element. Default = 'body geom', the tags, the members of relations and the geometry of every element and member, which multipolygon relations need. 'count' only returns the number of elements
+    timeout: int, Optional
+        The server timeout in seconds. Default = 180
+    newer: str, Optional
+        An ISO date, e.g. '2024-01-01T00:00:00Z'. Only elements changed after this date are returned. Default = None
+    """
+    west, south, east, north = bounds
+    changed = f'(newer:"{newer}")' if newer is not None else ''
+    statements = ''.join(f'nwr{f}{changed}({south},{west},{north},{east});' for f in overpass_filters(tags))
+    return f'[out:json][timeout:{timeout}];({statements});out {out};'
+
+
+def _way_geometry(element):
+    coords = [(point['lon'], point['lat']) for point in element.get('geometry', []) if point is not None]
+    if len(coords) < 2:
+        return None
+    if len(coords) >= 4 and coords[0] == coords[-1] and is_area(element.get('tags', {})):
+        return Polygon(coords)
+    return LineString(coords)
+
+
+def _relation_geometry(element):
+    #Multipolygon (and boundary) relations are built from their outer and inner member ways. Other relations are skipped, as osmnx does.
+    if element.get('tags', {}).get('type') not in ('multipolygon', 'boundary'):
+        return None
+    rings = {'outer': [], 'inner': []}
+    for member in element.get('members', []):
+        coords = [(point['lon'], point['lat']) for point in member.get('geometry', []) if point is not None]
+        if member.get('type') == 'way' and len(coords) >= 2:
+            rings['inner' if member.get('role') == 'inner' else 'outer'].append(LineString(coords))
+    outer = list(polygonize(rings['outer']))
+    if len(outer) == 0:
+        return None
+    geometry = MultiPolygon(outer) if len(outer) > 1 else outer[0]
+    inner = list(polygonize(rings['inner']))
+    for hole in inner:
+        geometry = geometry.difference(hole)
+    return geometry
+
+
+def elements_to_gdf(elements):
+    """
+    Return a GeoDataFrame of Overpass json elements (from 'out body geom'), indexed by element type and OSM id with a column per OSM tag, in lat, lon.
+    """
+    index, rows, geometries = [], [], []
+    for element in elements:
+        if element['type'] == 'node':
+            geometry = Point(element['lon'], element['lat'])
+        elif element['type'] == 'way':
+            geometry = _way_geometry(element)
+        else:
+            geometry = _relation_geometry(element)
+        if geometry is None:
+            continue
+        index.append((element['type'], element['id']))
+        rows.append(element.get('tags', {}))
+        geometries.append(geometry)
+
+    features = gpd.GeoDataFrame(rows, geometry = geometries, crs = 'EPSG:4326')
+    features.index = pd.MultiIndex.from_tuples(index, names = ['element_type', 'osmid'])
+    return features
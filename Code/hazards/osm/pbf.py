@@ -0,0 +1,126 @@
+from ..third_party import gpd, pd, osmium, wkb, box, unary_union
+
+#Reads OpenStreetMaps (OSM) features from a local .osm.pbf or .osm (XML) extract instead of the Overpass API.
+#The file is streamed with pyosmium, keeping only the elements with matching tags inside the region of interest, so national extracts can be processed without loading them into memory.
+
+
+def _check_osmium():
+    if osmium is None:
+        raise ImportError('pyosmium is needed to read local OSM extracts: pip install osmium')
+
+
+def _matches(element_tags, tags):
+    #Same rules as the osmnx tags argument: True (any value), a single value, or a list of values
+    for key, value in tags.items():
+        found = element_tags.get(key)
+        if found is None:
+            continue
+        if value is True or found == value or (isinstance(value, list) and found in value):
+            return True
+    return False
+
+
+def is_area(element_tags):
+    #Closed ways that osmnx returns as polygons rather than lines
+    return 'building' in element_tags or 'boundary' in element_tags or 'place' in element_tags or element_tags.get('area') == 'yes'
+
+
+def _read(file, tags, bounds, matches = _matches):
+    #Stream the file once and return the matching features that overlap bounds (min x, min y, max x, max y)
+    _check_osmium()
+    factory = osmium.geom.WKBFactory()
+    area = box(*bounds) if bounds is not None else None
+    index, rows, geometries = [], [], []
+
+    def keep(element_type, osmid, element_tags, geometry_wkb):
+        geometry = wkb.loads(geometry_wkb, hex = True)
+        if area is not None and not area.intersects(geometry):
+            return
+        index.append((element_type, osmid))
+        rows.append(element_tags)
+        geometries.append(geometry)
+
+    class Reader(osmium.SimpleHandler):
+        def node(self, n):
+            if len(n.tags) == 0 or not matches(n.tags, tags):
+                return
+            lon, lat = n.location.lon, n.location.lat
+            if bounds is not None and not (bounds[0] <= lon <= bounds[2] and bounds[1] <= lat <= bounds[3]):
+                return
+            keep('node', n.id, dict(n.tags), factory.create_point(n))
+
+        def way(self, w):
+            if not matches(w.tags, tags) or (w.is_closed() and is_area(w.tags)):
+                return
+            try:
+                keep('way', w.id, dict(w.tags), factory.create_linestring(w))
+            except RuntimeError:
+                pass #ways with missing nodes at the edge of the extract
+
+        def area(self, a):
+            if not matches(a.tags, tags) or (a.from_way() and not is_area(a.tags)):
+                return
+            try:
+                geometry_wkb = factory.create_multipolygon(a)
+            except RuntimeError:
+                return
+            keep('way' if a.from_way() else 'relation', a.orig_id(), dict(a.tags), geometry_wkb)
+
+    Reader().apply_file(file, locations = True)
+
+    #Single polygons from closed ways are returned as Polygons, as osmnx does
+    geometries = [g.geoms[0] if g.geom_type == 'MultiPolygon' and len(g.geoms) == 1 else g for g in geometries]
+    features = gpd.GeoDataFrame(rows, geometry = geometries, crs = 'EPSG:4326')
+    features.index = pd.MultiIndex.from_tuples(index, names = ['element_type', 'osmid'])
+    return features
+
+
+def place_boundary_from_file(file, name):
+    """
+    Return the boundary polygon of a named region from a local OSM extract. This is the offline equivalent of the place name lookup made by osmnx.
+
+    Parameters
+    ----------
+    file: str
+        The path of the .osm.pbf or .osm extract
+    name: str
+        The name of the region, e.g. 'Peebles' or 'Peebles, Scotland'. Only the text before the first comma is matched
+
+    Returns
+    -------
+    polygon: shapely.geometry.polygon.Polygon
+        The boundary of the region, or None if it is not found in the extract
+    """
+    name = name.split(',')[0].strip()
+
+    def matches(element_tags, tags):
+        return element_tags.get('name') == name and ('boundary' in element_tags or 'place' in element_tags)
+
+    boundaries = _read(file, {'name': name}, None, matches = matches)
+    boundaries = boundaries[boundaries.geom_type.isin(['Polygon', 'MultiPolygon'])]
+    if len(boundaries) == 0:
+        print(f'No boundary called {name} found in {file}')
+        return None
+    return unary_union(boundaries['geometry'].values)
+
+
+def features_from_file(file, polygon, tags):
+    """
+    Return the OpenStreetMaps (OSM) features with the given tags within a polygon, read from a local .osm.pbf or .osm extract. The result has the same layout as the osmnx features functions.
+
+    Parameters
+    ----------
+    file: str
+        The path of the .osm.pbf or .osm extract
+    polygon: shapely.geometry.polygon.Polygon
+        The region of interest, in lat, lon
+    tags: dict
+        The OSM tags of the features, e.g. {'building': True}
+
+    Returns
+    -------
+    features: geopandas.geodataframe.GeoDataFrame
+        The features indexed by element type and OSM id, with a column per OSM tag
+    """
+    features = _read(file, tags, polygon.bounds)
+    return features[features.intersects(polygon)]
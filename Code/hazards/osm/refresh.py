@@ -0,0 +1,157 @@
+import os
+import json
+import time
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from ..third_party import ox, Polygon, requests
+from .cache import settings, cache_key, downloaded, renew, discard, store
+from .source import source
+from .boundary import region_boundary
+from .bulk import LAYERS
+from .roads import networks, reduce_roads
+from .tiles import settings as tile_settings, tile_queries
+from .overpass import OVERPASS_URL, overpass_query
+
+#A cached query is checked by asking Overpass how many matching elements were changed since it was downloaded, and how many there are in total.
+#The total from the previous check is kept beside the cache, so elements deleted since then are also noticed.
+
+
+def _path(key):
+    return os.path.join(settings['folder'], 'refresh', f'{key}.json')
+
+
+def _read_total(key):
+    try:
+        with open(_path(key)) as file:
+            return json.load(file)['total']
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _write_total(key, total):
+    path = _path(key)
+    os.makedirs(os.path.dirname(path), exist_ok = True)
+    handle, temp = tempfile.mkstemp(dir = os.path.dirname(path), suffix = '.tmp')
+    with os.fdopen(handle, 'w') as file:
+        json.dump({'total': total}, file)
+    os.replace(temp, path)
+
+
+def _bounds(kind, query):
+    #Overpass queries take (min lon, min lat, max lon, max lat). Polygons are checked over their bounding box, which can only report extra changes, never miss one.
+    if kind == 'bbox':
+        north, south, east, west = query
+        return (west, south, east, north)
+    return query.bounds
+
+
+def change_counts(tags, bounds, since):
+    """
+    Return the number of OSM elements with the given tags within bounds that were changed after since, and the total number of them, from one Overpass count query.
+
+    Parameters
+    ----------
+    tags: dict
+        The OSM tags of the features, e.g. {'building': True}
+    bounds: Tuple[float, float, float, float]
+        The (min lon, min lat, max lon, max lat) of the region
+    since: float
+        The time in seconds since the epoch, e.g. when the cached copy was downloaded
+    """
+    newer = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(since))
+    query = overpass_query(tags, bounds, out = 'count', newer = newer)
+    query = query + overpass_query(tags, bounds, out = 'count').split(';', 1)[1]
+    response = requests.post(OVERPASS_URL, data = {'data': query}, timeout = 180)
+    response.raise_for_status()
+    changed, total = [int(element['tags']['total']) for element in response.json()['elements'] if element['type'] == 'count']
+    return changed, total
+
+
+def _queries(args, layers):
+    #The (layer, kind, query, tags) of every cache entry the region is stored under
+    queries = []
+    if len(args) == 1 and isinstance(args[0], str):
+        polygon = region_boundary(args[0])
+        for layer in layers:
+            if layer == 'roads':
+                queries.append((layer, 'roads', polygon, {'highway': True}))
+            else:
+                queries.append((layer, 'polygon', polygon, LAYERS[layer]))
+    elif len(args) == 4:
+        north, south, east, west = args
+        tiles = tile_queries(north, south, east, west)
+        for layer in layers:
+            if layer == 'roads':
+                #The box the landslide functions pass to road_network
+                queries.append((layer, 'roads', Polygon([(west, south), (west, north), (east, north), (east, south)]), {'highway': True}))
+            else:
+                queries.extend((layer, 'bbox', tile, LAYERS[layer]) for tile in tiles)
+    return queries
+
+
+def _download(kind, query, tags):
+    #Download again without reading the cache, and store the result in place of the old copy
+    try:
+        if kind == 'bbox':
+            features = ox.features_from_bbox(*query, tags = tags)
+        elif kind == 'roads':
+            features = reduce_roads(ox.features_from_polygon(query, tags = tags))
+            networks.pop((kind, query.wkb_hex), None)
+        else:
+            features = ox.features_from_polygon(query, tags = tags)
+    except ox._errors.InsufficientResponseError:
+        discard(kind, query, tags)
+        return
+    store(kind, query, tags, features)
+
+
+def _refresh(kind, query, tags):
+    #Returns the number of elements changed (or deleted) in the cached query, which has been downloaded again if this is not 0
+    since = downloaded(kind, query, tags)
+    if since is None:
+        return 0 #not cached, so it is downloaded when it is next used
+    key = cache_key(kind, query, tags)
+    changed, total = change_counts(tags, _bounds(kind, query), since)
+    previous = _read_total(key)
+    _write_total(key, total)
+    if previous is not None:
+        changed = max(changed, abs(previous - total))
+    if changed == 0:
+        renew(kind, query, tags)
+        return 0
+    _download(kind, query, tags)
+    return changed
+
+
+def refresh_region(*args, layers = ('buildings', 'rivers', 'roads')):
+    """
+    Bring the cached OpenStreetMaps (OSM) data of a region up to date. Each cached query (each tile of a lat, lon box) is checked with a small Overpass count query, and only those whose contents have changed since they were downloaded are downloaded again. The unchanged ones are kept for another ttl.
+
+    Parameters
+    ----------
+    *args: Union[str, Tuple[float, float, float, float]]
+        The positional arguments. This accepts either a single string 'location' value, which must be recognised as a region in OSM. Otherwise 4 float arguments are accepted as 'north, south, east, west', defining a box for the chosen region
+    layers: list, Optional
+        The layers to check, from 'buildings', 'rivers' and 'roads'. Default = ('buildings', 'rivers', 'roads')
+
+    Returns
+    -------
+    changed: dict
+        For each layer, the number of changed elements in each cached query (each tile of a lat, lon box, or the region polygon), keyed by the query. Only the queries with a count above 0 were downloaded again
+
+    Example: hazards.refresh_region(59.0, 55.0, -1.5, -6.0)
+    """
+    if source['file'] is not None:
+        print('The OSM data is read from a local extract, which is reloaded when the file changes. Nothing to refresh')
+        return {layer: {} for layer in layers}
+
+    queries = _queries(args, layers)
+    with ThreadPoolExecutor(max_workers = tile_settings['max_workers']) as pool:
+        results = list(pool.map(lambda query: _refresh(*query[1:]), queries))
+
+    changed = {layer: {} for layer in layers}
+    for query, result in zip(queries, results):
+        changed[query[0]][query[2]] = result
+    print(f'Checked {len(queries)} cached queries, downloaded again: {({layer: sum(1 for count in counts.values() if count) for layer, counts in changed.items()})}')
+    return changed
@@ -0,0 +1,55 @@
+from ..third_party import pd
+from .cache import cached
+from .source import query_kind
+from .boundary import region_boundary
+from .features import fetch_polygon
+
+#The columns of the road network used by the landslide functions
+COLUMNS = ['element_type', 'osmid', 'highway', 'name', 'geometry']
+
+#Full road networks already loaded in this session, keyed by region
+networks = {}
+
+
+def reduce_roads(roads):
+    #Keep only the ways and the columns that are used, with the highway class as a categorical
+    roads = roads.reset_index()
+    roads = roads[roads['element_type'] == 'way']
+    roads = roads[[column for column in COLUMNS if column in roads.columns]].reset_index(drop = True)
+    roads['highway'] = roads['highway'].astype('category')
+    return roads
+
+
+def _full_network(polygon):
+    #Download every highway within the polygon once
+    return reduce_roads(fetch_polygon(polygon, {'highway': True}))
+
+
+def road_network(area, tags = True):
+    """
+    Return the roads within a region from OpenStreetMaps (OSM). The full road network of the region is downloaded once (ways only, with the highway class stored as a categorical) and cached, and any subset of road classes is then taken from it without another download.
+
+    Parameters
+    ----------
+    area: Union[str, shapely.geometry.polygon.Polygon]
+        The name of the region, which must be recognised as a region in OSM, or a lat, lon polygon of the region
+    tags: Union[bool, str, list]
+        The road classes wanted, e.g. 'trunk', 'primary' or ['trunk', 'primary']. Default = True, meaning all road types are returned
+
+    Returns
+    -------
+    roads: geopandas.geodataframe.GeoDataFrame
+        The roads of the chosen classes, with their element type, OSM id, highway class, name and geometry
+
+    Example: hazards.road_network('Ojiya', tags = 'trunk')
+    """
+    polygon = region_boundary(area) if isinstance(area, str) else area
+    key = (query_kind('roads'), polygon.wkb_hex)
+    if key not in networks:
+        networks[key] = cached(query_kind('roads'), polygon, {'highway': True}, lambda: _full_network(polygon))
+    roads = networks[key]
+
+    if tags is True:
+        return roads.copy()
+    classes = tags if isinstance(tags, list) else [tags]
+    return roads[roads['highway'].isin(classes)].reset_index(drop = True)
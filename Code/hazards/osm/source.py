@@ -0,0 +1,33 @@
+import os
+
+#Where the OpenStreetMaps (OSM) data comes from. If a local extract has been chosen with osm_source() the features are read from that file instead of the Overpass API.
+source = {'file': None}
+
+
+def osm_source(file = None):
+    """
+    Choose where the OpenStreetMaps (OSM) data used by every function in the package comes from. By default it is downloaded from the Overpass API. Passing a local .osm.pbf or .osm (XML) extract reads the buildings, rivers and roads from that file instead, which works without network access.
+
+    Parameters
+    ----------
+    file: str, Optional
+        The path of the local extract. Default = None, meaning the data is downloaded from OSM
+
+    Returns
+    -------
+    None
+
+    Example: hazards.osm_source('scotland-latest.osm.pbf')
+    """
+    if file is not None and not os.path.exists(file):
+        print(f'FAILURE: {file} does not exist, the OSM source has not been changed')
+        return
+    source['file'] = file
+
+
+def query_kind(kind):
+    #Results read from an extract are cached separately from the downloaded ones, and again if the extract changes
+    file = source['file']
+    if file is None:
+        return kind
+    return f'{kind} {file} {os.path.getmtime(file)}'
@@ -0,0 +1,136 @@
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ..third_party import ox, pd, gpd, box, unary_union
+from .cache import store, read, cache_key
+from .source import source, query_kind
+from .features import features_from_bbox, fetch_bbox
+
+#Large lat, lon boxes are split into a fixed grid of tiles which are downloaded separately. The grid is aligned to multiples of the tile size, so neighbouring or overlapping boxes share tiles and reuse the cached ones.
+settings = {
+    'tile_size': 0.05,  #degrees
+    'max_workers': 4,
+    'retries': 3,
+    'backoff': 2.0,     #seconds, doubled after each failed attempt
+}
+
+
+def tile_settings(tile_size = None, max_workers = None, retries = None, backoff = None):
+    """
+    Change or view the settings used to split large lat, lon boxes into tiles for downloading.
+
+    Parameters
+    ----------
+    tile_size: float, Optional
+        The width and height of each tile in degrees. Default = None, meaning the current setting is kept (0.05 degrees)
+    max_workers: int, Optional
+        The number of tiles downloaded at the same time. Default = None, meaning the current setting is kept (4)
+    retries: int, Optional
+        The number of times a failed tile download is retried. Default = None, meaning the current setting is kept (3)
+    backoff: float, Optional
+        The wait in seconds before the first retry, doubled after each further failure. Default = None, meaning the current setting is kept (2 s)
+
+    Returns
+    -------
+    settings: dict
+        A copy of the tile settings after the changes have been made
+    """
+    if tile_size is not None:
+        settings['tile_size'] = tile_size
+    if max_workers is not None:
+        settings['max_workers'] = max_workers
+    if retries is not None:
+        settings['retries'] = retries
+    if backoff is not None:
+        settings['backoff'] = backoff
+    return dict(settings)
+
+
+def tile_grid(north, south, east, west, tile_size = None):
+    """
+    Return the (north, south, east, west) edges of the grid tiles that cover a lat, lon box.
+    """
+    if tile_size is None:
+        tile_size = settings['tile_size']
+    tiles = []
+    for j in range(math.floor(south / tile_size), math.ceil(north / tile_size)):
+        for i in range(math.floor(west / tile_size), math.ceil(east / tile_size)):
+            #Rounded so the same tile always gives the same cache key
+            tiles.append((round((j + 1) * tile_size, 9), round(j * tile_size, 9), round((i + 1) * tile_size, 9), round(i * tile_size, 9)))
+    return tiles
+
+
+def tile_queries(north, south, east, west):
+    """
+    Return the (north, south, east, west) boxes a lat, lon box is downloaded and cached as: the grid tiles covering it if it is larger than one tile, otherwise the box itself. Boxes read from a local extract (see osm_source) are not split either, as every query reads the whole file.
+    """
+    tile_size = settings['tile_size']
+    if source['file'] is not None or (north - south <= tile_size and east - west <= tile_size):
+        return [(north, south, east, west)]
+    return tile_grid(north, south, east, west)
+
+
+def fetch_tile(tile, tags, cache = True):
+    #Download one tile, retrying with an increasing wait. Tiles without any matching features (e.g. sea) give an empty GeoDataFrame, which is cached like any other tile so it is not downloaded again.
+    #With cache = False the tile is downloaded without reading or writing the cache, e.g. a combined query that is stored split into its layers instead
+    fetch = features_from_bbox if cache else fetch_bbox
+    for attempt in range(settings['retries'] + 1):
+        try:
+            return fetch(tile[0], tile[1], tile[2], tile[3], tags)
+        except ox._errors.InsufficientResponseError:
+            empty = gpd.GeoDataFrame(geometry = [], crs = 'EPSG:4326')
+            if cache:
+                store(query_kind('bbox'), tile, tags, empty)
+            return empty
+        except Exception:
+            if attempt == settings['retries']:
+                raise
+            time.sleep(settings['backoff'] * 2**attempt)
+
+
+def features_from_bbox_tiled(north, south, east, west, tags):
+    """
+    Return the OpenStreetMaps (OSM) features with the given tags within a lat, lon box. The box is split into the grid tiles that cover it, which are downloaded in parallel, cached separately and then merged, with features that cross tile edges only kept once. Boxes no larger than one tile, and boxes read from a local extract, are fetched in one query (see tile_queries).
+
+    Parameters
+    ----------
+    north, south, east, west: float
+        The edges of the box
+    tags: dict
+        The OSM tags of the features, e.g. {'building': True}
+
+    Returns
+    -------
+    features: geopandas.geodataframe.GeoDataFrame
+        The features intersecting the box, in the same layout as osmnx.features_from_bbox
+    """
+    tiles = tile_queries(north, south, east, west)
+    if len(tiles) > 1:
+        print(f'Downloading {len(tiles)} tiles')
+    with ThreadPoolExecutor(max_workers = settings['max_workers']) as pool:
+        results = list(pool.map(lambda tile: fetch_tile(tile, tags), tiles))
+    return merge_tiles(results, north, south, east, west)
+
+
+def merge_tiles(results, north, south, east, west):
+    #Join the tile results, keeping features that cross tile edges once, and cut them back to the requested box
+    results = [result for result in results if result is not None and len(result) != 0]
+    if len(results) == 0:
+        raise ox._errors.InsufficientResponseError('No matching features in any tile of the box')
+
+    features = pd.concat(results)
+    features = features[~features.index.duplicated(keep = 'first')]
+    return features[features.intersects(box(west, south, east, north))]
+
+
+def replace_tiles(features, tiles, tags, north, south, east, west):
+    #Swap the features of some tiles of a merged result for their copies now in the cache (e.g. after refresh_region downloaded those tiles again), keeping the features of the other tiles as they are
+    changed = unary_union([box(w, s, e, n) for n, s, e, w in tiles])
+    results = [features[~features.intersects(changed)]]
+    results += [read(cache_key(query_kind('bbox'), tile, tags)) for tile in tiles]
+    try:
+        merged = merge_tiles(results, north, south, east, west)
+    except ox._errors.InsufficientResponseError:
+        return features.iloc[:0]
+    return merged.reindex(columns = features.columns)
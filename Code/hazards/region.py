@@ -0,0 +1,166 @@
+import functools
+import inspect
+import warnings
+
+from .third_party import pd, ox
+from .osm.cache import settings as cache_settings
+from .osm.bulk import features_layers
+from .osm.refresh import refresh_region
+from .osm.bulk import LAYERS
+from .osm.tiles import replace_tiles
+
+#The stored results that are calculated from each OSM layer, removed from a region when that layer changes
+DEPENDS = {
+    'buildings': ('building_setup', 'building_centroids', 'building_elev', 'building_river_distance'),
+    'rivers': ('river', 'river_list', 'river_data', 'river_elevation', 'river_buffer', 'river_network', 'building_elev', 'building_river_distance'),
+    'roads': (),
+}
+
+#The stored results of building_setup and river, which hold the layers themselves
+BASE = {'buildings': ('building_setup',), 'rivers': ('river',)}
+
+
+class HazardRegion:
+    """
+    A region (place name or lat, lon box) whose OpenStreetMaps (OSM) data is loaded once and shared between analyses. The flood functions accept a HazardRegion in place of *args, and store the buildings, rivers, region polygon and the results derived from them (clipped rivers, river buffers, building centroids, etc.) on the region the first time they are needed. Later calls reuse these instead of downloading or calculating them again.
+
+    Parameters
+    ----------
+    *args: Union[str, Tuple[float, float, float, float]]
+        The positional arguments. This accepts either a single string 'location' value, which must be recognised as a region in OSM. Otherwise 4 float arguments (or a tuple of them) are accepted as 'north, south, east, west', defining a box for the chosen region
+
+    Example: peebles = hazards.HazardRegion('Peebles')
+             hazards.building_dis(peebles)
+             hazards.buffered_piechart(peebles, inner_distance = 0.001)
+    """
+    def __init__(self, *args):
+        if len(args) == 1 and isinstance(args[0], (tuple, list)):
+            args = tuple(args[0])
+        if not ((len(args) == 1 and isinstance(args[0], str)) or len(args) == 4):
+            print('Invalid arguments passed. Either -')
+            print('        1 value: The name of a given area')
+            print('        4 values: lat1, lat2, lon1, lon2')
+        self.args = args
+        self.memo = {}
+
+    def __repr__(self):
+        return f'HazardRegion{self.args}'
+
+    def prefetch(self):
+        #Download the buildings and rivers in one combined query the first time either is needed. The split layers are stored in the OSM cache, where building_setup and river then find them.
+        if 'layers' in self.memo or not cache_settings['enabled']:
+            return
+        try:
+            features_layers(*self.args)
+        except ox._errors.InsufficientResponseError as error:
+            #Nothing was found in the combined query, building_setup and river report which layer is missing when they download it separately
+            warnings.warn(f'No buildings or rivers were found for {self}: {error}')
+        self.memo['layers'] = True
+
+    def set_layers(self, buildings, rivers, polygon):
+        #Store layers downloaded elsewhere (e.g. by fetch_regions) as the results of building_setup and river for this region
+        self.memo['layers'] = True
+        self.memo['set_layers'] = True
+        self.memo[('building_setup',)] = buildings
+        self.memo[('river',)] = (rivers, polygon)
+
+    def refresh(self, layers = ('buildings', 'rivers', 'roads')):
+        """
+        Check the cached OSM data of this region for changes and download again only the tiles that changed (see refresh_region). The stored buildings and rivers of a lat, lon box have just the features of those tiles replaced, and the stored results calculated from them are forgotten. Layers stored with set_layers (e.g. by fetch_regions) are always forgotten, and read again from the cache when next needed.
+
+        Returns
+        -------
+        changed: dict
+            For each layer, the number of changed elements in each cached query (tile), keyed by the query
+        """
+        changed = refresh_region(*self.args, layers = layers)
+        given = self.memo.pop('set_layers', False)
+        stale = set()
+        patched = {}
+        for layer in layers:
+            tiles = [tile for tile, count in changed[layer].items() if count]
+            if not (tiles or given):
+                continue
+            stale.update(DEPENDS[layer])
+            key = BASE.get(layer)
+            if given or len(self.args) != 4 or key not in self.memo:
+                continue
+            #Only the features of the changed tiles are swapped, the rest of the layer is kept
+            north, south, east, west = self.args
+            if layer == 'rivers':
+                rivers, polygon = self.memo[key]
+                patched[key] = (replace_tiles(rivers, tiles, LAYERS[layer], north, south, east, west), polygon)
+            else:
+                patched[key] = replace_tiles(self.memo[key], tiles, LAYERS[layer], north, south, east, west)
+        self.memo = {key: value for key, value in self.memo.items() if not (isinstance(key, tuple) and key[0] in stale)}
+        self.memo.update(patched)
+        return changed
+
+    def clear(self):
+        #Forget everything loaded for this region, so it is downloaded again on the next call.
+        self.memo = {}
+
+    @property
+    def buildings(self):
+        from .floods.build_step import building_setup
+        return building_setup(self)
+
+    @property
+    def rivers(self):
+        from .floods.river import river
+        return river(self, print_list = False)[0]
+
+    @property
+    def polygon(self):
+        from .floods.river import river
+        return river(self, print_list = False)[1]
+
+
+def find_region(args):
+    #Return the HazardRegion passed within args, or None if the function was called with a place name or box
+    for arg in args:
+        if isinstance(arg, HazardRegion):
+            return arg
+    return None
+
+
+def _copy(value):
+    #Copies are returned so the functions that add columns to their results do not change the stored layers
+    if isinstance(value, tuple):
+        return tuple(_copy(v) for v in value)
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy()
+    return value
+
+
+def region_cache(*keys, base = False):
+    """
+    Decorator that lets a function accept a HazardRegion in place of *args. The result is stored on the region under the function name and the values of the arguments named in keys, so it is only calculated once per region.
+
+    Parameters
+    ----------
+    *keys: str
+        The names of the arguments that change the result, e.g. 'buffer'
+    base: bool, Optional
+        True for the functions that download the OSM data themselves. These are called with the place name or box the region was created with. Default = False, meaning the region is passed on so the functions called inside also reuse the stored data
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            region = find_region(args)
+            if region is None:
+                return func(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (func.__name__,) + tuple(bound.arguments[k] for k in keys)
+            if key not in region.memo:
+                if base:
+                    region.prefetch()
+                    args = tuple(a for arg in args for a in (region.args if arg is region else (arg,)))
+                region.memo[key] = func(*args, **kwargs)
+            return _copy(region.memo[key])
+        return wrapper
+    return decorator
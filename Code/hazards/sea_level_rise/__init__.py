@@ -15,3 +15,4 @@ from .sea_level_bar_chart import sea_level_bar_chart
 from .sea_level_building_density import sea_level_building_density
 from .sea_level_buildings import sea_level_buildings
 from .sea_level_buildings_plot import sea_level_buildings_plot
+from .sea_level_index import sea_level_index
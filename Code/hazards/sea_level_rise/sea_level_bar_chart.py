@@ -1,6 +1,8 @@
 from ..third_party import np, pd, ox, rasterio, Polygon, plt
+from ..dem.bands import band_edges
+from .sea_level_index import sea_level_index
 
-def sea_level_bar_chart(geotiff, place = None, low = 0, step_size = 10, count = 5, tag_list = None, chart_type = 'linear', split = True, size = 10, title = True):
+def sea_level_bar_chart(geotiff, place = None, low = 0, step_size = 10, count = 5, tag_list = None, chart_type = 'linear', split = True, size = 10, title = True, index = None, resolution = None):
     """
     A bar chart of the distribution of building types with different sea level elevations, as well as a DataFrame of the values shown in this plot (the building types, elevations and counts per layer). 
 
@@ -26,6 +28,10 @@ def sea_level_bar_chart(geotiff, place = None, low = 0, step_size = 10, count =
         This is the size of the figure produced. Default = 10
     title = bool        
         Toggle for the title on the Figure. Default = True
+    index: ElevationIndex
+        The buildings from an earlier sea_level_index call with the same tag_list (a ValueError is raised if it does not hold every type in tag_list), so other low, step_size and count values are plotted without fetching the buildings or reading the DEM again. Default = None
+    resolution: float
+        the DEM pixel size in metres that is good enough. The elevations are read from the coarsest overview of the geotiff that meets it (see build_overviews). Default = None, meaning the full resolution
         
     Returns
     -------
@@ -39,25 +45,6 @@ def sea_level_bar_chart(geotiff, place = None, low = 0, step_size = 10, count =
     Example: hazards.sea_level_bar_chart('FileName', low = 10)
     """
 
-    #Extract the necessary elevation information and the subsequent lat lon information
-        
-    src = rasterio.open(geotiff)
-    elevation = src.read(1)
-    with rasterio.open(geotiff) as dem:
-        transform = dem.transform
-    b = transform[2]
-    d = transform[5]
-    a = transform[0]
-    c = transform[4]
-    
-    #Create dataset of 1,2,3,4,...,n*m-2
-    n,m = np.shape(elevation)
-    linear_sequence = np.arange(n*m)
-    result_matrix = linear_sequence.reshape((n,m))
-    
-    #Flatten the elevation
-    flat_elevation = pd.DataFrame({'Elevation': elevation.flatten()})
-    
     if tag_list == None:
         tag_list = ['residential', 'retail', 'commercial', 'hospital', 'school']
     else:
@@ -69,42 +56,19 @@ def sea_level_bar_chart(geotiff, place = None, low = 0, step_size = 10, count =
             print('Split = True requires a residential tag to be passed within the tag_list augement')
             return    
         
-    column_names = [f'Column{i}' for i in range(1, count + 1)]
-    bar_chart = pd.DataFrame(index = tag_list, columns = column_names)         
-    column = ['Nan']
+    if index is None:
+        #Fetch every requested building type in one query, and find the elevation of each building once
+        index = sea_level_index(geotiff, place = place, tag = tag_list, resolution = resolution)
+    else:
+        #A type missing from a passed index was not fetched, rather than having no buildings
+        missing = [tag for tag in tag_list if tag not in index.groups]
+        if len(index) != 0 and missing:
+            raise ValueError(f'The index does not hold any {missing} buildings, it holds {list(index.groups)}. Build it with sea_level_index(geotiff, tag = tag_list)')
     
-    j = 0 
-    for i in list(range(1, count + 1)):
-        j = j + 1
-        maxim = low + i * step_size
-        minim = low + (i - 1) * step_size
-        p_values = result_matrix[(elevation < maxim) & (elevation > minim)]
-        column = np.append(column, f'{minim}-{maxim}m')
-        
-        for tag in tag_list: 
-            if place == None:
-                #If there is no defined area then must make a polygon to call the buildings with
-                end_x = a * m + b
-                end_y = c * n + d 
-                polygon = Polygon([(b,d), (b,end_y), (end_x, end_y), (end_x,d)])
-                buildings = ox.features_from_polygon(polygon, tags = {'building':tag})
-            else:
-                buildings = ox.features_from_place(place, tags = {'building':tag})
-            
-            if len(buildings) == 0:
-                
-                bar_chart[f'Column{j}'][tag] = 0
-            else:
-                buildings['centroid'] = (buildings['geometry'].to_crs(crs = 3857).centroid).to_crs(crs = 4326)
-                
-                buildings['p'] = (( buildings['centroid'].y - d ) / c ).astype(int) * m + (( buildings['centroid'].x - b ) / a).astype(int)
-                buildings = buildings[buildings['p'] >= 0]
-                
-                bar_chart[f'Column{j}'][tag] = buildings[buildings['p'].isin(p_values)]['p'].count()
-
-                
-    column = column[1:]
-    bar_chart.columns= column
+    #The number of buildings of each type in every elevation band, from the sorted elevations
+    edges = band_edges(low, step_size, count)
+    bar_chart = index.band_counts(edges, by_group = True).reindex(tag_list, fill_value = 0)
+    bar_chart.columns = [f'{edges[i]}-{edges[i + 1]}m' for i in range(count)]
     
     
     #residential = bar_chart.loc['residential']
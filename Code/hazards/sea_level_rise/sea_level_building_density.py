@@ -1,6 +1,8 @@
 from ..third_party import np, pd, ox, rasterio, Polygon, plt
+from ..dem.bands import band_edges
+from .sea_level_index import sea_level_index
 
-def sea_level_building_density(geotiff, place = None, low = 0, step_size = 10, count = 10, high = None , tag = 'residential', size = 10, title = True):
+def sea_level_building_density(geotiff, place = None, low = 0, step_size = 10, count = 10, high = None , tag = 'residential', size = 10, title = True, index = None, resolution = None):
     """
     This is a plot of the buildings that fall between the low and high elevation values provided, to visualise the sea level rise risk in a given region. The geotiff data will be used to extract information from OpenStreetMaps (OSM), or an additional place will be required. 
 
@@ -24,6 +26,10 @@ def sea_level_building_density(geotiff, place = None, low = 0, step_size = 10, c
         This is the size of the figure produced. Default = 10
     title = bool        
         Toggle for the title on the Figure. Default = True   
+    index: ElevationIndex
+        The buildings from an earlier sea_level_index call, so other low, step_size and count values are plotted without fetching the buildings or reading the DEM again. Only the buildings of type tag are counted, so an index of several types can be reused for each of them. Default = None
+    resolution: float
+        the DEM pixel size in metres that is good enough. The elevations are read from the coarsest overview of the geotiff that meets it (see build_overviews). Default = None, meaning the full resolution
         
     Returns
     -------
@@ -37,55 +43,21 @@ def sea_level_building_density(geotiff, place = None, low = 0, step_size = 10, c
     
     count = count + 2
     
-    #Extract the necessary elevation information and the subsequent lat lon information
-    src = rasterio.open(geotiff)
-    elevation = src.read(1)
-    with rasterio.open(geotiff) as dem:
-        transform = dem.transform
-    b = transform[2]
-    d = transform[5]
-    a = transform[0]
-    c = transform[4]
-    
-    #Create dataset of 1,2,3,4,...,n*m-2
-    n,m = np.shape(elevation)
-    linear_sequence = np.arange(n*m)
-    result_matrix = linear_sequence.reshape((n,m))
-    
-    #Flatten the elevation
-    flat_elevation = pd.DataFrame({'Elevation': elevation.flatten()})
-    
-    if place == None:
-        #If there is no defined area then must make a polygon to call the buildings with
-        end_x = a * m + b
-        end_y = c * n + d 
-        polygon = Polygon([(b,d), (b,end_y), (end_x, end_y), (end_x,d)])
-        buildings = ox.features_from_polygon(polygon, tags = {'building':tag})
-    else:
-        buildings = ox.features_from_place(place, tags = {'building':tag})
-        
-    buildings['centroid'] = (buildings['geometry'].to_crs(crs = 3857).centroid).to_crs(crs = 4326)
-    
-    buildings['p'] = (( buildings['centroid'].y - d ) / c ).astype(int) * m + (( buildings['centroid'].x - b ) / a).astype(int)
-    buildings = buildings[buildings['p'] >= 0]
-    
-    numbers = []
-    cum_num = []
-    cumulative = 0
+    if index is None:
+        index = sea_level_index(geotiff, place = place, tag = tag, resolution = resolution)
     
     if high != None:
         count = int((high - low) / step_size) + 2
     
-    
-    for i in list(range(1,count)):
-        maxim = low + i * step_size
-        minim = low + (i - 1) * step_size
-        p_values = result_matrix[(elevation < maxim) & (elevation > minim)]
-        buildings_covered = buildings[buildings['p'].isin(p_values)]
-        number = np.shape(buildings_covered)[0]
-        numbers = np.append(numbers, number)
-        cumulative = cumulative + number
-        cum_num = np.append(cum_num, cumulative)
+    #Every band is counted from the sorted elevations, with the cumulative count running up the bands
+    counts = index.band_counts(band_edges(low, step_size, count - 1), by_group = True)
+    if tag in counts.index:
+        numbers = counts.loc[tag].to_numpy()
+    elif len(index) == 0:
+        numbers = np.zeros(count - 1, dtype = int)
+    else:
+        raise ValueError(f"The index does not hold any '{tag}' buildings, it holds {list(counts.index)}")
+    cum_num = np.cumsum(numbers)
     x = list(range(low,(low + (count -1) * step_size), step_size))
     fig, ax1 = plt.subplots(figsize = (size, size*0.7))
     
@@ -1,6 +1,9 @@
 from ..third_party import pd, np, ox, Polygon, rasterio, Point
+from ..osm.features import features_from_place, features_from_polygon
+from ..dem.window import dem_polygon, point_elevations
+from ..dem.bands import in_band
 
-def sea_level_buildings(geotiff, place = None, low = 0, high = 10, tag = 'residential'):
+def sea_level_buildings(geotiff, place = None, low = 0, high = 10, tag = 'residential', resolution = None):
     """
     Return the buildings and cut_buildings which are the reduced dataframes of the buildings, all optained from OpenStreetMaps (OSM). The cut_buildings are cut based off of the chosen elevations called by the function and help to highlight which buildings are within certain regions of risk.
 
@@ -16,42 +19,26 @@ def sea_level_buildings(geotiff, place = None, low = 0, high = 10, tag = 'reside
         this is the lowest elevation of the returned cut buildings. Default = 0 m
     high: int
         this is the highest elevation of the returned cut buildings. Default = 10 m 
+    resolution: float
+        the DEM pixel size in metres that is good enough. The elevations are read from the coarsest overview of the geotiff that meets it (see build_overviews). Default = None, meaning the full resolution
     Returns
     -------
     buildings: geopandas.geodataframe.GeoDataFrame
-        this is a list of all the buildings within the called region
+        this is a list of all the buildings within the called region that are on the DEM, with their 'elevation (m)'
     cut_buildings: geopandas.geodataframe.GeoDataFrame
         this is a list of the buildings contained in the dataframe that falls between the low and high elevations picked
     
     
     Example: hazards.sea_level_buildings('FileName', low = 10, high = 40, tags = True)
     """
-    #Extract the necessary elevation information and the subsequent lat lon information
-    src = rasterio.open(geotiff)
-    elevation = src.read(1)
-    with rasterio.open(geotiff) as dem:
-        transform = dem.transform
-    b = transform[2]
-    d = transform[5]
-    a = transform[0]
-    c = transform[4]
-    
-    #Create dataset of 1,2,3,4,...,n*m-2
-    n,m = np.shape(elevation)
-    linear_sequence = np.arange(n*m)
-    result_matrix = linear_sequence.reshape((n,m))
-    
-    #Flatten the elevation
-    flat_elevation = pd.DataFrame({'Elevation': elevation.flatten()})
-    end_x = a * m + b
-    end_y = c * n + d 
-    polygon = Polygon([(b,d), (b,end_y), (end_x, end_y), (end_x,d)])
+    #The region covered by the DEM, from its header
+    polygon = dem_polygon(geotiff)
     
     if place == None:
         #If there is no defined area then must make a polygon to call the buildings with
-        buildings = ox.features_from_polygon(polygon, tags = {'building':tag})
+        buildings = features_from_polygon(polygon, tags = {'building':tag})
     else:
-        buildings = ox.features_from_place(place, tags = {'building':tag})
+        buildings = features_from_place(place, tags = {'building':tag})
         
         
     buildings['centroid'] = (buildings['geometry'].to_crs(crs = 3857).centroid).to_crs(crs = 4326)
@@ -61,10 +48,10 @@ def sea_level_buildings(geotiff, place = None, low = 0, high = 10, tag = 'reside
     	buildings = buildings[polygon.contains(build_points)]
     
     
-    buildings['p'] = (( buildings['centroid'].y - d ) / c ).astype(int) * m + (( buildings['centroid'].x - b ) / a).astype(int)
-    buildings = buildings[buildings['p'] >= 0]
+    #The elevation of the pixel under each building, NaN off the DEM or on nodata
+    buildings['elevation (m)'] = point_elevations(geotiff, buildings['centroid'], resolution = resolution)
+    buildings = buildings[buildings['elevation (m)'].notna()]
     
-    p_values = result_matrix[(elevation < high) & (elevation > low)]
-    buildings_covered = buildings[buildings['p'].isin(p_values)]
+    buildings_covered = buildings[in_band(buildings['elevation (m)'], low, high)]
     
     return buildings, buildings_covered
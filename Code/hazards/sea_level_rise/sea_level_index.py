@@ -0,0 +1,44 @@
+from ..third_party import np
+from ..osm.features import features_from_place, features_from_polygon
+from ..dem.window import dem_polygon, point_elevations
+from ..dem.bands import ElevationIndex
+
+def sea_level_index(geotiff, place = None, tag = 'residential', resolution = None):
+    """
+    Return an ElevationIndex of the buildings in a region, grouped by building type, for counting the buildings in elevation bands. The buildings are fetched and the DEM is read once, so sea_level_building_density and sea_level_bar_chart can be called with several low, step_size and count values on the same index.
+
+    Parameters
+    ----------
+    geotiff: .tiff
+        this is the geotiff file of the DEM elevation data used to assess the chosen region
+    place: str
+        this is the location provided for OSM to extract data. Without this augument, the extracted data will match the region provided in the DEM dataset. Default = None
+    tag: Union[str, list]
+        this specifies which buildings to extract from the OSM dataset, e.g. 'residential' or ['residential', 'retail']. Default = 'residential'
+    resolution: float
+        the DEM pixel size in metres that is good enough. The elevations are read from the coarsest overview of the geotiff that meets it (see build_overviews). Default = None, meaning the full resolution
+
+    Returns
+    -------
+    index: ElevationIndex
+        The sorted elevations of the buildings on the DEM, grouped by their 'building' value
+
+
+    Example: index = hazards.sea_level_index('FileName', tag = ['residential', 'retail'])
+    """
+    #The region covered by the DEM, from its header
+    polygon = dem_polygon(geotiff)
+    
+    if place == None:
+        #If there is no defined area then the buildings are called within the DEM polygon
+        buildings = features_from_polygon(polygon, tags = {'building':tag})
+    else:
+        buildings = features_from_place(place, tags = {'building':tag})
+    
+    if len(buildings) == 0:
+        return ElevationIndex(np.empty(0))
+    
+    centroids = (buildings['geometry'].to_crs(crs = 3857).centroid).to_crs(crs = 4326)
+    
+    #The elevation of the pixel under each building, NaN off the DEM or on nodata
+    return ElevationIndex(point_elevations(geotiff, centroids, resolution = resolution), buildings['building'])
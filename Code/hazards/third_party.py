@@ -8,10 +8,31 @@ import plotly.express as px
 import osmnx as ox
 from shapely.geometry import Point, LineString, Polygon, MultiPolygon, MultiLineString
 import rasterio
+from rasterio.features import rasterize
+from rasterio.windows import Window
+from rasterio.enums import Resampling
 import shapely.wkt as wkt
 from shapely.wkt import loads
+import shapely.wkb as wkb
+from shapely.geometry import box
+from shapely.ops import unary_union, polygonize
+import shapely
+from shapely import STRtree
 import seaborn as sns
 import folium as folium 
 from folium.plugins import MarkerCluster 
 import networkx as nx
+import requests
+try:
+    import osmium #Optional, only needed to read local .osm.pbf extracts
+except ImportError:
+    osmium = None
+try:
+    import aiohttp #Optional, only needed for the asynchronous multi-region downloads
+except ImportError:
+    aiohttp = None
+try:
+    from scipy.ndimage import distance_transform_edt #Optional, only needed for the raster river distance engine
+except ImportError:
+    distance_transform_edt = None
 #from mapclassify import classify #<-- ???? 
@@ -14,11 +14,12 @@ setup(
         'numpy >=1.17.3, <1.25.0',
         'matplotlib',
         'pandas',
-        'geopandas',
+        'geopandas >=0.10',
         'plotly',
         'osmnx',
-        'shapely',
+        'shapely >=2.0',
         'rasterio',
-        'shapely'
+        'pyarrow',
+        'requests'
         ],
     )